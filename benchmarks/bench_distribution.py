@@ -0,0 +1,35 @@
+"""
+Benchmarks for the target histogram and power-law helpers.
+"""
+import numpy as np
+
+from scenfirepy import build_target_hist, estimate_powerlaw
+
+from .common import powerlaw_events
+
+
+class TargetHistSuite:
+    params = ([1_000, 100_000, 10_000_000], [10, 50, 200])
+    param_names = ["n_events", "num_bins"]
+
+    def setup(self, n_events, num_bins):
+        self.sizes = powerlaw_events(n_events)
+        self.surfaces = np.ones(1000)
+
+    def time_build_target_hist(self, n_events, num_bins):
+        build_target_hist(self.sizes, self.surfaces, num_bins=num_bins)
+
+    def peakmem_build_target_hist(self, n_events, num_bins):
+        build_target_hist(self.sizes, self.surfaces, num_bins=num_bins)
+
+
+class PowerlawFitSuite:
+    params = [1_000, 100_000]
+    param_names = ["n_events"]
+    timeout = 300
+
+    def setup(self, n_events):
+        self.sizes = powerlaw_events(n_events, alpha=2.3)
+
+    def time_estimate_powerlaw(self, n_events):
+        estimate_powerlaw(self.sizes)
@@ -0,0 +1,41 @@
+"""
+Import-time benchmarks: `import scenfirepy` must not load pandas or rasterio.
+"""
+import subprocess
+import sys
+
+# modules only the FLP20 / raster helpers need
+HEAVY = ("pandas", "rasterio")
+
+
+class ImportSuite:
+    """
+    Cost of importing the package in a fresh interpreter, as paid by every
+    worker of a process pool. timeraw_ benchmarks run in a new process, so
+    nothing is cached from earlier imports.
+    """
+
+    timeout = 120
+
+    def timeraw_import_scenfirepy(self):
+        return "import scenfirepy"
+
+    def timeraw_import_select_events(self):
+        return "from scenfirepy import select_events"
+
+    def timeraw_import_flp20_to_raster(self):
+        return "from scenfirepy import flp20_to_raster"
+
+    def track_heavy_modules_loaded(self):
+        """Number of HEAVY modules loaded by `import scenfirepy` (0)."""
+        code = (
+            "import sys, scenfirepy; "
+            f"print(sum(m in sys.modules for m in {HEAVY!r}))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+        )
+        return int(out.stdout)
+
+    track_heavy_modules_loaded.unit = "modules"
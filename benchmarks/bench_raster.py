@@ -0,0 +1,64 @@
+"""
+Benchmarks for the FLP20 raster pipeline on generated GeoTIFFs.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .common import make_flp20
+
+
+class RasterRoundTripSuite:
+    """
+    FLP20 raster -> events (flp20_to_df) -> burn-probability GeoTIFF
+    (flp20_to_raster) on square rasters of increasing size.
+    """
+
+    params = [512, 2048, 8192]
+    param_names = ["size"]
+    timeout = 1200
+
+    def setup(self, size):
+        from scenfirepy import load_event_store
+
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "flp20.tif")
+        self.out = os.path.join(self.tmp, "bp.tif")
+        n = make_flp20(self.path, size)
+        self.bp = np.random.default_rng(0).random(n)
+        # build the event store once; the store benchmarks only load it
+        load_event_store(self.path)
+
+    def teardown(self, size):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def time_flp20_to_df(self, size):
+        from scenfirepy import flp20_to_df
+
+        flp20_to_df(self.path)
+
+    def time_flp20_to_raster(self, size):
+        from scenfirepy import flp20_to_raster
+
+        flp20_to_raster(self.path, self.bp, self.out)
+
+    def time_round_trip(self, size):
+        self._round_trip()
+
+    def peakmem_round_trip(self, size):
+        self._round_trip()
+
+    def time_round_trip_event_store(self, size):
+        from scenfirepy import flp20_to_raster, load_event_store
+
+        store = load_event_store(self.path)
+        flp20_to_raster(store, self.bp, self.out)
+
+    def _round_trip(self):
+        from scenfirepy import flp20_to_df, flp20_to_raster
+
+        df = flp20_to_df(self.path)
+        bp = np.full(len(df), 1.0 / len(df))
+        flp20_to_raster(self.path, bp, self.out)
@@ -0,0 +1,108 @@
+"""
+Benchmarks for select_events (run with `asv run` from the repository root).
+
+Every suite records wall time (time_), peak RSS (peakmem_) and the quality
+reached for the time spent, as 1 / (discrepancy * seconds) (higher is
+better).
+"""
+import time
+
+from scenfirepy import select_events
+
+from .common import powerlaw_events, selection_kwargs
+
+
+def _discrepancy_per_second(kwargs):
+    t0 = time.perf_counter()
+    res = select_events(**kwargs)
+    elapsed = time.perf_counter() - t0
+    return 1.0 / (max(res["discrepancy"], 1e-12) * elapsed)
+
+
+class ScalingSuite:
+    """select_events from 10^3 to 10^7 events, per sampling engine."""
+
+    params = (
+        ["tree", "keys", "batch"],
+        [1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+    )
+    param_names = ["method", "n_events"]
+    timeout = 1200
+
+    def setup(self, method, n_events):
+        if method == "tree" and n_events > 1_000_000:
+            # minutes per run; the keys engines cover this range
+            raise NotImplementedError
+        sizes = powerlaw_events(n_events)
+        self.kwargs = selection_kwargs(sizes, max_it=10, method=method)
+
+    def time_select_events(self, method, n_events):
+        select_events(**self.kwargs)
+
+    def peakmem_select_events(self, method, n_events):
+        select_events(**self.kwargs)
+
+    def track_discrepancy_per_second(self, method, n_events):
+        return _discrepancy_per_second(self.kwargs)
+
+    track_discrepancy_per_second.unit = "1/(L1*s)"
+
+
+class SettingsSuite:
+    """Sensitivity to iter_limit, max_it and num_bins on 10^5 events."""
+
+    params = ([1_000, 100_000], [10, 100], [10, 50])
+    param_names = ["iter_limit", "max_it", "num_bins"]
+    timeout = 600
+
+    def setup(self, iter_limit, max_it, num_bins):
+        sizes = powerlaw_events(100_000)
+        self.kwargs = selection_kwargs(
+            sizes, num_bins=num_bins, iter_limit=iter_limit, max_it=max_it,
+            method="keys",
+        )
+
+    def time_select_events(self, iter_limit, max_it, num_bins):
+        select_events(**self.kwargs)
+
+    def track_discrepancy(self, iter_limit, max_it, num_bins):
+        return select_events(**self.kwargs)["discrepancy"]
+
+    track_discrepancy.unit = "L1"
+
+    def track_discrepancy_per_second(self, iter_limit, max_it, num_bins):
+        return _discrepancy_per_second(self.kwargs)
+
+    track_discrepancy_per_second.unit = "1/(L1*s)"
+
+
+class StrategySuite:
+    """
+    Random vs stratified attempts on the same event set.
+
+    time_select_events gives the cost of a run and track_discrepancy the
+    quality reached; track_discrepancy_per_second combines them.
+    """
+
+    params = (["random", "stratified"], [10_000, 1_000_000])
+    param_names = ["strategy", "n_events"]
+    timeout = 600
+
+    def setup(self, strategy, n_events):
+        sizes = powerlaw_events(n_events)
+        self.kwargs = selection_kwargs(
+            sizes, method="keys", strategy=strategy
+        )
+
+    def time_select_events(self, strategy, n_events):
+        select_events(**self.kwargs)
+
+    def track_discrepancy(self, strategy, n_events):
+        return select_events(**self.kwargs)["discrepancy"]
+
+    track_discrepancy.unit = "L1"
+
+    def track_discrepancy_per_second(self, strategy, n_events):
+        return _discrepancy_per_second(self.kwargs)
+
+    track_discrepancy_per_second.unit = "1/(L1*s)"
@@ -0,0 +1,57 @@
+"""
+Synthetic inputs shared by the benchmark suites.
+"""
+import numpy as np
+
+
+def powerlaw_events(n, alpha=2.0, xmin=1.0, seed=0):
+    """Synthetic power-law event sizes, used as sizes and as weights."""
+    rng = np.random.default_rng(seed)
+    return xmin * (1 - rng.random(n)) ** (-1 / (alpha - 1))
+
+
+def selection_kwargs(sizes, num_bins=20, surface_fraction=0.4, **kwargs):
+    """select_events arguments targeting the histogram of sizes itself."""
+    from scenfirepy import build_target_hist
+
+    target = build_target_hist(sizes, np.ones_like(sizes), num_bins=num_bins)
+    total = float(sizes.sum())
+    return dict(
+        dict(
+            event_sizes=sizes,
+            event_probabilities=sizes,
+            target_hist=target["target_hist"],
+            bins=target["bins"],
+            reference_surface=total,
+            surface_threshold=surface_fraction * total,
+            tolerance=0.0,
+            iter_limit=500_000,
+            max_it=20,
+            seed=123,
+        ),
+        **kwargs,
+    )
+
+
+def make_flp20(path, size, seed=0):
+    """
+    Write a size x size FLP20-like GeoTIFF (tiled float32, 30 m cells): half
+    of the cells hold a positive value, a few are nan. Returns the number of
+    fire cells.
+    """
+    import rasterio
+    from rasterio.transform import from_origin
+
+    rng = np.random.default_rng(seed)
+    data = rng.random((size, size), dtype=np.float32)
+    data[data < 0.5] = 0
+    data[rng.random((size, size)) < 0.01] = np.nan
+
+    profile = dict(
+        driver="GTiff", height=size, width=size, count=1, dtype="float32",
+        crs="EPSG:32719", transform=from_origin(0, 0, 30, 30), tiled=True,
+        blockxsize=256, blockysize=256, compress="deflate",
+    )
+    with rasterio.open(path, "w", **profile) as dst:
+        dst.write(data, 1)
+    return int(np.count_nonzero(np.isfinite(data) & (data > 0)))
@@ -4,6 +4,9 @@ scenfirepy
 Python implementation of the SCENFIRE fire-scenario framework.
 """
 
+import importlib
+import sys
+import types
 from importlib.metadata import version, PackageNotFoundError
 
 try:
@@ -11,26 +14,87 @@ try:
 except PackageNotFoundError:
     __version__ = "0.0.0"
 
-from .preprocess import check_fire_data
-from .distribution import build_target_hist, calculate_discrepancy, fit_powerlaw
+from .preprocess import check_fire_data, check_fire_data_chunked
+from .distribution import (
+    build_target_hist,
+    build_target_hist_batch,
+    build_target_hist_chunked,
+    calculate_discrepancy,
+    estimate_powerlaw,
+    fit_powerlaw,
+    fit_powerlaw_batch,
+    powerlaw_gof,
+)
 from .selection import select_events
+from .parallel import select_events_parallel
+from .refine import refine_selection
+from .sweep import sweep
 from .params import get_select_params
 from .create_distribution import create_distribution
-from .burn_probability import calc_burn_probability
-from .flp20_to_df import flp20_to_df
-from .flp20_to_bp_df import flp20_to_bp_df
-from .flp20_to_raster import flp20_to_raster
+from .burn_probability import (
+    calc_burn_probability,
+    calc_burn_probability_ensemble,
+)
+
+# Functions needing pandas or rasterio are imported on first access (PEP 562),
+# so `import scenfirepy` (e.g. in selection workers) only loads NumPy.
+_LAZY = {
+    "flp20_to_df": ".flp20_to_df",
+    "iter_flp20_df": ".flp20_to_df",
+    "flp20_to_bp_df": ".flp20_to_bp_df",
+    "flp20_to_raster": ".flp20_to_raster",
+    "build_event_store": ".event_store",
+    "load_event_store": ".event_store",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # importing submodule flp20_to_df binds it on the package under the
+        # name of its function: keep resolving the function instead
+        if name in _LAZY and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
 
 __all__ = [
     "check_fire_data",
+    "check_fire_data_chunked",
     "build_target_hist",
+    "build_target_hist_batch",
+    "build_target_hist_chunked",
     "calculate_discrepancy",
     "fit_powerlaw",
+    "fit_powerlaw_batch",
+    "estimate_powerlaw",
+    "powerlaw_gof",
     "select_events",
+    "select_events_parallel",
+    "refine_selection",
+    "sweep",
     "get_select_params",
     "create_distribution",
     "calc_burn_probability",
+    "calc_burn_probability_ensemble",
     "flp20_to_df",
+    "iter_flp20_df",
     "flp20_to_bp_df",
     "flp20_to_raster",
+    "build_event_store",
+    "load_event_store",
 ]
@@ -1,16 +1,23 @@
 import numpy as np
 
 
-def calc_burn_probability(selected_events, event_surfaces):
+def calc_burn_probability(selected_events, event_surfaces, as_index=False):
     """
     Literal port of SCENFIRE R::calc_burn_probability()
 
     Parameters
     ----------
     selected_events : array-like (int/bool)
-        Indicator vector of selected fire events (1 = selected, 0 = not).
+        Indicator vector of selected fire events (1 = selected, 0 = not),
+        or the indices of the selected events when as_index is True.
     event_surfaces : array-like (float)
         Burned surface/area associated with each event.
+    as_index : bool
+        Index-native mode: selected_events holds event indices (e.g. the
+        "surface_index" of select_events) and only the burn probability of
+        those events is returned, aligned with them, instead of a dense
+        vector over all events. Pass both to flp20_to_raster(...,
+        event_index=...) to write them without densifying.
 
     Returns
     -------
@@ -18,6 +25,9 @@ def calc_burn_probability(selected_events, event_surfaces):
         Burn probability per event surface unit.
     """
 
+    if as_index:
+        return _burn_probability_at(selected_events, event_surfaces)
+
     selected_events = np.asarray(selected_events, dtype=float)
     event_surfaces = np.asarray(event_surfaces, dtype=float)
 
@@ -38,3 +48,142 @@ def calc_burn_probability(selected_events, event_surfaces):
     burn_probability = (selected_events * event_surfaces) / total_selected
 
     return burn_probability
+
+
+def _burn_probability_at(surface_index, event_surfaces):
+    """calc_burn_probability restricted to the selected event indices."""
+    surface_index = np.asarray(surface_index, dtype=np.int64)
+    event_surfaces = np.asarray(event_surfaces, dtype=float)
+
+    if surface_index.ndim != 1:
+        raise ValueError("selected event indices must be a 1D array")
+
+    if event_surfaces.size == 0:
+        raise ValueError("Input vectors must be non-empty")
+
+    if surface_index.size == 0:
+        raise ValueError("No selected events to compute burn probability")
+
+    if surface_index.min() < 0 or surface_index.max() >= event_surfaces.size:
+        raise ValueError("surface index out of range of event_surfaces")
+
+    if np.unique(surface_index).size != surface_index.size:
+        raise ValueError("selected event indices must not contain duplicates")
+
+    selected_surfaces = event_surfaces[surface_index]
+
+    if np.any(selected_surfaces < 0):
+        raise ValueError("event_surfaces must be non-negative")
+
+    return selected_surfaces / surface_index.size
+
+
+def _replicate_indices(surface_indices):
+    """Selected event indices of each replicate, from index arrays or rows
+    of a sparse (n_replicates, n_events) indicator matrix."""
+    if hasattr(surface_indices, "tocsr"):
+        # a copy: the canonicalization below must not touch the caller's
+        # matrix (tocsr() of a CSR matrix is the matrix itself)
+        csr = surface_indices.tocsr(copy=True)
+        # one entry per (replicate, event) cell
+        csr.sum_duplicates()
+        csr.eliminate_zeros()
+        if np.any(csr.data != 1):
+            raise ValueError("indicator matrix entries must be 0 or 1")
+        for r in range(csr.shape[0]):
+            yield csr.indices[csr.indptr[r]:csr.indptr[r + 1]]
+    else:
+        for idx in surface_indices:
+            yield idx
+
+
+def calc_burn_probability_ensemble(
+    surface_indices,
+    event_surfaces,
+    return_variance=False,
+):
+    """
+    Mean burn probability over many selected scenarios, in one pass.
+
+    Equivalent to averaging calc_burn_probability over N replicate
+    selections, without building their N dense indicator vectors: each
+    replicate only adds 1 / k (and 1 / k**2 for the variance) at its k
+    selected events, so memory is O(n_events) whatever N. As with
+    calc_burn_probability(as_index=True), a replicate listing an event
+    twice raises ValueError.
+
+    Parameters
+    ----------
+    surface_indices : iterable of array-like (int) | scipy.sparse matrix
+        Selected event indices of each replicate (e.g. the "surface_index"
+        of several select_events results; may be a generator), or a sparse
+        (n_replicates, n_events) indicator matrix (entries 0 or 1; left
+        unchanged).
+    event_surfaces : array-like (float)
+        Burned surface/area associated with each event.
+    return_variance : bool
+        Also return the per-event variance of burn probability across
+        replicates (population variance, ddof=0).
+
+    Returns
+    -------
+    dict with keys:
+      - "burn_probability": np.ndarray (mean burn probability per event)
+      - "selection_frequency": np.ndarray (share of replicates selecting
+        each event)
+      - "variance": np.ndarray | None
+      - "n_replicates": int
+    """
+
+    event_surfaces = np.asarray(event_surfaces, dtype=float)
+    n = event_surfaces.size
+
+    if n == 0:
+        raise ValueError("Input vectors must be non-empty")
+
+    if np.any(event_surfaces < 0):
+        raise ValueError("event_surfaces must be non-negative")
+
+    hits = np.zeros(n, dtype=np.int64)
+    acc = np.zeros(n, dtype=float)
+    acc_sq = np.zeros(n, dtype=float) if return_variance else None
+    n_replicates = 0
+
+    for idx in _replicate_indices(surface_indices):
+        idx = np.sort(np.asarray(idx, dtype=np.int64))
+
+        if idx.size == 0:
+            raise ValueError("No selected events to compute burn probability")
+
+        if idx[0] < 0 or idx[-1] >= n:
+            raise ValueError("surface index out of range of event_surfaces")
+
+        # as in calc_burn_probability(as_index=True); it also makes the
+        # fancy-indexed += below exact (no repeated index)
+        if np.any(idx[1:] == idx[:-1]):
+            raise ValueError(
+                "selected event indices must not contain duplicates"
+            )
+
+        hits[idx] += 1
+        acc[idx] += 1.0 / idx.size
+        if return_variance:
+            acc_sq[idx] += 1.0 / idx.size ** 2
+        n_replicates += 1
+
+    if n_replicates == 0:
+        raise ValueError("No replicate selections provided")
+
+    mean = event_surfaces * acc / n_replicates
+
+    variance = None
+    if return_variance:
+        variance = event_surfaces ** 2 * acc_sq / n_replicates - mean ** 2
+        variance = np.clip(variance, 0.0, None)
+
+    return {
+        "burn_probability": mean,
+        "selection_frequency": hits / n_replicates,
+        "variance": variance,
+        "n_replicates": n_replicates,
+    }
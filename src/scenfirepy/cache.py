@@ -0,0 +1,103 @@
+# src/scenfirepy/cache.py
+"""
+Content-addressed disk cache of select_events results.
+
+An entry is keyed by a blake2b digest of the input arrays (dtype, shape and
+bytes), of the parameters that determine the result, and of
+_ALGORITHM_VERSION. Entries are .npz files (selected indices compressed,
+scalars as JSON) in one directory; reading an entry refreshes its mtime,
+and after every write the least recently used entries are removed until
+the directory fits in its size bound.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# bump whenever select_events may return a different result for the same
+# inputs and seed; entries of other versions are never matched
+_ALGORITHM_VERSION = 1
+_HASH_CHUNK = 2**22
+
+
+def _hash_array(h, a):
+    a = np.asarray(a)
+    h.update(f"{a.dtype.str}{a.shape}".encode())
+    flat = a.reshape(-1)
+    step = max(1, _HASH_CHUNK // max(1, a.itemsize))
+    for start in range(0, flat.size, step):
+        h.update(np.ascontiguousarray(flat[start:start + step]).data)
+
+
+def _cache_key(arrays, params):
+    """Hex digest of named arrays and JSON-serializable params."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"scenfirepy-select-v{_ALGORITHM_VERSION}".encode())
+    for name in sorted(arrays):
+        h.update(name.encode())
+        _hash_array(h, arrays[name])
+    h.update(json.dumps(params, sort_keys=True, default=repr).encode())
+    return h.hexdigest()
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(os.fspath(cache_dir), f"{key}.npz")
+
+
+def _cache_get(cache_dir, key):
+    """Cached (surface_index, scalars) for key, or None."""
+    path = _entry_path(cache_dir, key)
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            index = data["surface_index"]
+            scalars = json.loads(str(data["scalars"]))
+    except (OSError, KeyError, ValueError):
+        return None
+    try:
+        os.utime(path)  # least recently used = oldest mtime
+    except OSError:
+        pass
+    return index, scalars
+
+
+def _cache_put(cache_dir, key, surface_index, scalars, max_bytes):
+    """Store an entry atomically, then evict down to max_bytes."""
+    cache_dir = os.fspath(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".npz", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(
+                f,
+                surface_index=np.asarray(surface_index),
+                scalars=np.array(json.dumps(scalars)),
+            )
+        os.replace(tmp, _entry_path(cache_dir, key))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _evict(cache_dir, max_bytes)
+
+
+def _evict(cache_dir, max_bytes):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npz") and not entry.name.startswith("."):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
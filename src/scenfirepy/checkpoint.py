@@ -0,0 +1,74 @@
+# src/scenfirepy/checkpoint.py
+"""
+Checkpoints of select_events runs.
+
+A checkpoint is a small .npz file holding everything the attempt loop
+carries from one attempt to the next: the best selection so far, the
+attempt count, the running discrepancy statistics and the state of the
+random generator (its bit_generator.state as JSON), along with a digest
+of the inputs and options of the run, so that a checkpoint is only
+resumed by the run it belongs to. It is written to a temporary file next
+to the target and moved over it with os.replace, so a run killed
+mid-write leaves the previous checkpoint intact.
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# bump when the content changes; older checkpoints are refused
+_CHECKPOINT_VERSION = 1
+
+
+def _save_checkpoint(path, state):
+    """Atomically write state (see _load_checkpoint) to path."""
+    path = os.fspath(path)
+    meta = {
+        "version": _CHECKPOINT_VERSION,
+        "rng_state": state["rng_state"],
+        "inputs": state["inputs"],
+        "attempt": int(state["attempt"]),
+        "best_disc": float(state["best_disc"]),
+        "best_total": float(state["best_total"]),
+        "has_best": state["best"] is not None,
+        "trajectory": [float(v) for v in state["trajectory"]],
+    }
+    best = state["best"]
+    if best is None:
+        best = np.array([], dtype=np.int64)
+
+    parent = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".npz", dir=parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                # array-valued generator states (e.g. MT19937) as lists
+                meta=np.array(json.dumps(meta, default=np.ndarray.tolist)),
+                best=np.asarray(best, dtype=np.int64),
+            )
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _load_checkpoint(path):
+    """
+    State dict of a checkpoint: rng_state (dict), inputs (digest of the
+    inputs and options of the run), attempt, best_disc, best_total, best
+    (int array or None; per-group counts in the multiset mode) and
+    trajectory (list of floats).
+    """
+    with np.load(os.fspath(path), allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        best = data["best"]
+
+    if meta.get("version") != _CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version in {path}")
+
+    state = dict(meta)
+    state["best"] = best if meta["has_best"] else None
+    return state
@@ -1,4 +1,7 @@
-from .preprocess import check_fire_data
+import numpy as np
+
+from .distribution import build_target_hist, fit_powerlaw
+from .preprocess import _assess
 from .params import get_select_params
 from .selection import select_events
 
@@ -13,16 +16,44 @@ def create_distribution(
     max_iter=1000,
     tol=1e-6,
     seed=None,
+    strategy="random",
+    time_budget=None,
+    deadline=None,
+    cache=None,
 ):
     """
-    Literal port of SCENFIRE R::create_distribution()
+    Port of SCENFIRE R::create_distribution()
+
+    Orchestrates validation, parameter setup, and event selection:
+      - the check_fire_data verdict on (sizes, event_surfaces), computed
+        without printing, checks that the simulated events can cover the
+        observed fires and gives the surface threshold (its recommended
+        value; ValueError with the reason if they cannot);
+      - the target histogram is that of a power-law sample
+        fit_powerlaw(xmin, alpha, len(sizes), seed), on num_bins bins
+        spanning sizes and event_surfaces (log-spaced if logaritmic);
+      - select_events picks among event_surfaces, with equal weights, until
+        the threshold is reached (max_it=max_iter, tolerance=tol).
 
-    Orchestrates validation, parameter setup, and event selection.
+    strategy is passed to select_events ("random" or "stratified"), as are
+    time_budget (seconds) and deadline (time.time() timestamp), which bound
+    the wall-clock time of the selection, and cache (directory of the
+    select_events result cache).
+
+    Returns the dict of select_events.
     """
 
-    # Validate inputs (R::check_fire_data)
-    sizes = check_fire_data(sizes)
-    event_surfaces = check_fire_data(event_surfaces)
+    sizes = np.asarray(sizes, dtype=float)
+    event_surfaces = np.asarray(event_surfaces, dtype=float)
+
+    # Validate inputs (R::check_fire_data, without its printed report)
+    if sizes.size == 0 or event_surfaces.size == 0:
+        raise ValueError("Empty fire size vectors.")
+    sufficient, reason, _, surface_threshold = _assess(
+        sizes.max(), sizes.sum(), event_surfaces.max(), event_surfaces.sum()
+    )
+    if not sufficient:
+        raise ValueError(reason)
 
     # Collect and validate parameters (R::get_select_params)
     params = get_select_params(
@@ -35,17 +66,33 @@ def create_distribution(
         seed=seed,
     )
 
+    # Target distribution: power law with the given xmin and alpha
+    sample = fit_powerlaw(
+        params["xmin"], params["alpha"], sizes.size, seed=params["seed"]
+    )
+    hist = build_target_hist(sample, event_surfaces, params["num_bins"])
+    bins = hist["bins"]
+    target_hist = hist["target_hist"]
+    if not params["logaritmic"]:
+        bins = np.linspace(bins[0], bins[-1], int(params["num_bins"]) + 1)
+        target_hist, _ = np.histogram(sample, bins=bins, density=True)
+
     # Select events (R::select_events)
     result = select_events(
-        sizes=sizes,
-        event_surfaces=event_surfaces,
-        xmin=params["xmin"],
-        alpha=params["alpha"],
-        num_bins=params["num_bins"],
-        logaritmic=params["logaritmic"],
-        max_iter=params["max_iter"],
-        tol=params["tol"],
+        event_sizes=event_surfaces,
+        event_probabilities=np.ones_like(event_surfaces),
+        target_hist=target_hist,
+        bins=bins,
+        reference_surface=float(sizes.sum()),
+        surface_threshold=surface_threshold,
+        tolerance=params["tol"],
+        iter_limit=event_surfaces.size,
+        max_it=params["max_iter"],
         seed=params["seed"],
+        strategy=strategy,
+        time_budget=time_budget,
+        deadline=deadline,
+        cache=cache,
     )
 
     return result
@@ -1,5 +1,17 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
+from .streaming import _CHUNK, _chunks, _is_one_shot, _map_parts, _parts
+from .streaming import _range_of
+
+# bytes of working memory for one block of catalog rows
+_BATCH_BUDGET = 2**22
+# bytes of working memory for one block of the KS scan (kept small: the
+# temporaries are reused from block to block)
+_KS_BUDGET = 2**22
+
 def build_target_hist(sizes, event_surfaces, num_bins=10):
     sizes = np.asarray(sizes, dtype=float)
     event_surfaces = np.asarray(event_surfaces, dtype=float)
@@ -21,6 +33,100 @@ def build_target_hist(sizes, event_surfaces, num_bins=10):
     return {"target_hist": target_hist, "bins": bins}
 
 
+def build_target_hist_chunked(sizes, event_surfaces=None, num_bins=10,
+                              bins=None, chunk_size=_CHUNK, n_jobs=1):
+    """
+    build_target_hist in constant memory, for catalogs that do not fit in
+    memory (e.g. FConstMTT / FSim outputs split across files).
+
+    Two passes over the chunks of sizes: the first finds the smallest
+    positive value and the largest value (together with event_surfaces, as
+    build_target_hist), the second accumulates the bin counts. Sources are
+    split into parts (array slices, files) reduced in a thread pool and
+    merged. In-memory arrays give exactly build_target_hist.
+
+    Parameters
+    ----------
+    sizes : array | memmap | .npy path | list of those | callable | iterable
+        Values to histogram (see scenfirepy.streaming for the accepted
+        sources). A one-shot iterable needs bins (one pass); wrap it in a
+        callable returning a fresh iterable to allow both passes.
+    event_surfaces : same kinds | None (only used for the bin range)
+    num_bins : int
+    bins : array-like | None (explicit bin edges; skips the first pass)
+    chunk_size : int (values per chunk)
+    n_jobs : int | None (threads; None = os.cpu_count())
+
+    Returns
+    -------
+    dict with keys "target_hist" and "bins", as build_target_hist.
+    """
+    chunk_size = int(chunk_size)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    size_parts = _parts(sizes, chunk_size)
+
+    if bins is None:
+        if _is_one_shot(sizes):
+            raise ValueError(
+                "sizes can only be read once: pass bins, or a callable "
+                "returning the chunks"
+            )
+        parts = list(size_parts)
+        if event_surfaces is not None:
+            parts += _parts(event_surfaces, chunk_size)
+        ranges = _map_parts(
+            lambda part: _range_of(_chunks(part, chunk_size)), parts, n_jobs
+        )
+        vmin = min(lo for lo, _ in ranges)
+        vmax = max(hi for _, hi in ranges)
+        if not np.isfinite(vmin):
+            raise ValueError("sizes has no positive value")
+        bins = np.exp(
+            np.linspace(np.log(vmin), np.log(vmax), int(num_bins) + 1)
+        )
+    bins = np.asarray(bins, dtype=float)
+    n_bins = bins.size - 1
+
+    def count(part):
+        counts = np.zeros(n_bins + 1, dtype=np.int64)
+        for chunk in _chunks(part, chunk_size):
+            counts += np.bincount(
+                _bin_index(chunk, bins), minlength=n_bins + 1
+            )
+        return counts
+
+    counts = np.sum(_map_parts(count, size_parts, n_jobs), axis=0)
+    target_hist = _density(counts[:n_bins], np.diff(bins))
+
+    return {"target_hist": target_hist, "bins": bins}
+
+
+def _bin_index(values, bins):
+    """
+    Histogram bin of each value, with the conventions of np.histogram
+    (half-open bins, last bin closed). Values outside the bins get
+    len(bins) - 1, one past the last bin.
+    """
+    values = np.asarray(values, dtype=float)
+    n_bins = bins.size - 1
+    idx = np.digitize(values, bins) - 1
+    idx[values == bins[-1]] = n_bins - 1
+    idx[(idx < 0) | (idx >= n_bins)] = n_bins
+    return idx
+
+
+def _density(counts, widths):
+    """
+    Density histogram from per-bin counts (last axis), computed as
+    np.histogram(..., density=True) does. Rows without counts give nan.
+    """
+    total = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return counts / widths / total
+
+
 def calculate_discrepancy(hist, target_hist):
     return float(np.sum(np.abs(hist - target_hist)))
 
@@ -28,4 +134,365 @@ def calculate_discrepancy(hist, target_hist):
 def fit_powerlaw(xmin, alpha, n, seed=None):
     rng = np.random.default_rng(seed)
     u = rng.random(n)
-    return xmin * (1 - u) ** (-1 / (alpha - 1)) 
+    return xmin * (1 - u) ** (-1 / (alpha - 1))
+
+
+def _row_blocks(n_rows, n_cols, budget=_BATCH_BUDGET):
+    """Slices of rows of an (n_rows, n_cols) matrix, about budget bytes of
+    float64 each."""
+    rows = max(1, budget // (8 * max(1, n_cols)))
+    for start in range(0, n_rows, rows):
+        yield slice(start, min(start + rows, n_rows))
+
+
+def fit_powerlaw_batch(xmin, alpha, n, n_catalogs, seed=None, out=None):
+    """
+    Batched fit_powerlaw: n_catalogs synthetic catalogs of n sizes each.
+
+    The catalogs are the rows of one matrix filled from a single random
+    stream, block of rows by block of rows, in place. The stream is consumed
+    as rng.random((n_catalogs, n)) would, so row 0 is fit_powerlaw(xmin,
+    alpha, n, seed) and the first rows do not depend on n_catalogs.
+
+    Parameters
+    ----------
+    xmin, alpha, n : as in fit_powerlaw
+    n_catalogs : int (number of catalogs, R)
+    seed : int | np.random.Generator | None (rng seed)
+    out : None | str | np.ndarray
+        None: a new (R, n) array. str: path of a .npy file created as a
+        memory map (np.lib.format.open_memmap), for batches larger than
+        memory. Array: an existing float64 (R, n) array to fill.
+
+    Returns
+    -------
+    numpy float64 array or memmap of shape (R, n)
+    """
+    n = int(n)
+    n_catalogs = int(n_catalogs)
+    if n <= 0 or n_catalogs <= 0:
+        raise ValueError("n and n_catalogs must be positive")
+
+    rng = np.random.default_rng(seed)
+    shape = (n_catalogs, n)
+    if out is None:
+        out = np.empty(shape, dtype=float)
+    elif isinstance(out, (str, os.PathLike)):
+        out = np.lib.format.open_memmap(
+            out, mode="w+", dtype=np.float64, shape=shape
+        )
+    elif out.shape != shape or out.dtype != np.float64:
+        raise ValueError(f"out must be a float64 array of shape {shape}")
+
+    for blk in _row_blocks(n_catalogs, n):
+        # same operations as fit_powerlaw, in place
+        block = out[blk]
+        rng.random(out=block)
+        np.subtract(1, block, out=block)
+        # in-place ** keeps NumPy's scalar-power shortcuts (e.g. alpha=2
+        # gives a reciprocal), as in fit_powerlaw
+        block **= -1 / (alpha - 1)
+        np.multiply(xmin, block, out=block)
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def build_target_hist_batch(catalogs, event_surfaces=None, num_bins=10,
+                            bins=None):
+    """
+    Target histograms of many catalogs (rows) on shared bins.
+
+    With bins=None the edges are those of build_target_hist computed over
+    all catalogs (and event_surfaces) at once, so the histograms are
+    comparable; a single catalog gives exactly build_target_hist. Each
+    block of rows is binned in one step: the bin index of every value is
+    offset by its row and a single bincount gives all the row counts.
+
+    Parameters
+    ----------
+    catalogs : array-like (R, n) (e.g. from fit_powerlaw_batch; memmaps are
+        read block by block)
+    event_surfaces : array-like | None (also used for the bin range)
+    num_bins : int
+    bins : array-like | None (explicit shared bin edges)
+
+    Returns
+    -------
+    dict with keys:
+      - "target_hist": numpy array (R, num_bins) of densities
+      - "bins": numpy array of the shared bin edges
+    """
+    if not isinstance(catalogs, np.ndarray):
+        catalogs = np.asarray(catalogs, dtype=float)
+    if catalogs.ndim == 1:
+        catalogs = catalogs[None, :]
+    if catalogs.ndim != 2:
+        raise ValueError("catalogs must be a 2D array (catalogs x sizes)")
+    n_rows, n_cols = catalogs.shape
+
+    if bins is None:
+        vmin = np.inf
+        vmax = -np.inf
+        parts = (catalogs[blk] for blk in _row_blocks(n_rows, n_cols))
+        if event_surfaces is not None:
+            parts = [*parts, np.asarray(event_surfaces, dtype=float)]
+        for part in parts:
+            part = np.asarray(part, dtype=float)
+            vmin = min(vmin, np.min(part, where=part > 0, initial=np.inf))
+            vmax = max(vmax, np.max(part, initial=-np.inf))
+        bins = np.exp(
+            np.linspace(np.log(vmin), np.log(vmax), int(num_bins) + 1)
+        )
+    bins = np.asarray(bins, dtype=float)
+    widths = np.diff(bins)
+    n_bins = widths.size
+
+    target_hist = np.empty((n_rows, n_bins))
+    for blk in _row_blocks(n_rows, n_cols):
+        block = np.asarray(catalogs[blk], dtype=float)
+        rows = block.shape[0]
+        idx = _bin_index(block, bins)
+        idx += np.arange(rows)[:, None] * (n_bins + 1)
+        counts = np.bincount(idx.ravel(), minlength=rows * (n_bins + 1))
+        counts = counts.reshape(rows, n_bins + 1)[:, :n_bins]
+        target_hist[blk] = _density(counts, widths)
+
+    return {"target_hist": target_hist, "bins": bins}
+
+
+def _sorted_sample(data):
+    x = np.asarray(data, dtype=float).ravel()
+    x = np.sort(x[np.isfinite(x) & (x > 0)])
+    return x
+
+
+def _ks_scan(x, log_x, starts, log_xmin, alphas, budget=_KS_BUDGET):
+    """
+    KS distance between the tail x[start:] and the power law (xmin, alpha)
+    fitted on it, for every candidate start (ascending). Candidates are processed in
+    blocks of rows of one (candidates, tail) matrix bounded by budget.
+    """
+    n = x.size
+    ks = np.empty(starts.size)
+    c = 0
+    while c < starts.size:
+        i0 = starts[c]
+        width = n - i0
+        rows = max(1, budget // (32 * width))
+        blk = slice(c, min(c + rows, starts.size))
+
+        s = starts[blk][:, None]
+        a = alphas[blk][:, None]
+        lo = log_xmin[blk][:, None]
+        m = n - s
+        k = np.arange(i0, n)[None, :] - s  # rank in the tail, < 0 = not in
+        with np.errstate(over="ignore", invalid="ignore"):
+            model = -np.expm1((1 - a) * (log_x[None, i0:] - lo))
+            d = np.maximum((k + 1) / m - model, model - k / m)
+        d[k < 0] = 0.0
+        ks[blk] = d.max(axis=1)
+        c = blk.stop
+    return ks
+
+
+def estimate_powerlaw(data, xmin=None, max_candidates=1000, min_tail=10):
+    """
+    Fit a continuous power law to the tail of data (Clauset et al. 2009).
+
+    For a given xmin the MLE is alpha = 1 + m / sum(log(x / xmin)) over the
+    m values >= xmin. The data are sorted once, so the log-sums of every
+    candidate tail come from one reverse cumulative sum of log(x) and all
+    alphas cost O(n). xmin is the candidate whose fit has the lowest
+    Kolmogorov-Smirnov distance to its tail; the KS distances are computed
+    in vectorized blocks of candidates.
+
+    Each KS distance is O(n), so the scan costs O(max_candidates * n): about
+    1 s per 100 candidates on 10**6 values (some 10-15 s with the default
+    1000). For large samples lower max_candidates, or fix xmin; powerlaw_gof
+    repeats the scan for every replicate.
+
+    Parameters
+    ----------
+    data : array-like (observed sizes; non-positive and non-finite values
+        are ignored)
+    xmin : float | None (fixed lower bound; None = scan the candidates)
+    max_candidates : int | None (candidates of the scan: the distinct
+        values, thinned to this many evenly spaced ones; None = all of them,
+        O(n) each)
+    min_tail : int (smallest tail size of a candidate)
+
+    Returns
+    -------
+    dict with keys:
+      - "xmin": float
+      - "alpha": float (MLE exponent)
+      - "sigma": float (standard error of alpha, (alpha - 1) / sqrt(n_tail))
+      - "ks": float (KS distance of the fit to the tail)
+      - "n_tail": int (number of values >= xmin)
+      - "n": int (number of values used)
+    The dict can be passed to get_select_params as fit.
+    """
+    x = _sorted_sample(data)
+    n = x.size
+    min_tail = max(1, int(min_tail))
+    if n < min_tail:
+        raise ValueError(f"at least {min_tail} positive values are needed")
+
+    log_x = np.log(x)
+    # log_sums[i] = sum(log_x[i:])
+    log_sums = np.cumsum(log_x[::-1])[::-1]
+
+    if xmin is not None:
+        if xmin <= 0:
+            raise ValueError("xmin must be a positive number")
+        starts = np.searchsorted(x, [float(xmin)])
+        if n - starts[0] < min_tail:
+            raise ValueError(f"fewer than {min_tail} values >= xmin")
+        cand = np.array([float(xmin)])
+    else:
+        cand, starts = np.unique(x, return_index=True)
+        keep = n - starts >= min_tail
+        cand, starts = cand[keep], starts[keep]
+        if max_candidates is not None and cand.size > max_candidates:
+            pick = np.unique(
+                np.linspace(0, cand.size - 1, int(max_candidates)).round()
+            ).astype(int)
+            cand, starts = cand[pick], starts[pick]
+
+    m = n - starts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alphas = 1 + m / (log_sums[starts] - m * np.log(cand))
+    valid = np.isfinite(alphas) & (alphas > 1)
+    if not valid.any():
+        raise ValueError("no tail with a finite power-law fit")
+    cand, starts, alphas = cand[valid], starts[valid], alphas[valid]
+
+    ks = _ks_scan(x, log_x, starts, np.log(cand), alphas)
+
+    best = int(np.argmin(ks))
+    n_tail = int(n - starts[best])
+    alpha = float(alphas[best])
+    return {
+        "xmin": float(cand[best]),
+        "alpha": alpha,
+        "sigma": (alpha - 1) / np.sqrt(n_tail),
+        "ks": float(ks[best]),
+        "n_tail": n_tail,
+        "n": int(n),
+    }
+
+
+# per-process inputs of the bootstrap, set once by _init_gof_worker
+_GOF_WORKER = {}
+
+
+def _init_gof_worker(data):
+    _GOF_WORKER["data"] = data
+
+
+def _gof_replicates(seed_seqs):
+    """KS distances of the refits of synthetic datasets, one per seed."""
+    data = _GOF_WORKER["data"]
+    x = data["x"]
+    fit = data["fit"]
+    body = x[:x.size - fit["n_tail"]]
+    p_tail = fit["n_tail"] / x.size
+
+    out = []
+    for seed_seq in seed_seqs:
+        rng = np.random.default_rng(seed_seq)
+        # semi-parametric: power-law tail, body resampled from the data
+        n_tail = rng.binomial(x.size, p_tail) if body.size else x.size
+        synth = np.concatenate([
+            fit_powerlaw(fit["xmin"], fit["alpha"], n_tail, seed=rng),
+            rng.choice(body, x.size - n_tail) if body.size else body,
+        ])
+        try:
+            ks = estimate_powerlaw(synth, **data["options"])["ks"]
+        except ValueError:
+            ks = np.nan
+        out.append(ks)
+    return out
+
+
+def powerlaw_gof(data, fit=None, n_boot=1000, seed=None, n_jobs=1,
+                 **options):
+    """
+    Bootstrap goodness-of-fit p-value of a power-law fit (Clauset et al.
+    2009).
+
+    Each replicate draws a synthetic dataset of the same size: a
+    Binomial(n, n_tail / n) number of values from the fitted power law, the
+    rest resampled from the data below xmin. It is refitted with the same
+    options and its KS distance recorded; the p-value is the share of
+    replicates at least as far from their fit as the data (p > 0.1 is the
+    usual threshold for a plausible power law).
+
+    Replicate i uses np.random.SeedSequence(seed).spawn(n_boot)[i], so the
+    result does not depend on n_jobs.
+
+    Parameters
+    ----------
+    data : array-like (observed sizes)
+    fit : dict | None (result of estimate_powerlaw on data; fitted here
+        with options when None)
+    n_boot : int (number of synthetic datasets)
+    seed : int | None (root seed)
+    n_jobs : int | None (worker processes; 1 = in this process, None =
+        os.cpu_count())
+    **options : estimate_powerlaw options (xmin, max_candidates, min_tail)
+
+    Returns
+    -------
+    dict with keys:
+      - "p_value": float
+      - "ks": float (KS distance of the data)
+      - "ks_boot": numpy array of the replicate KS distances (nan when a
+        replicate could not be fitted; those are not counted)
+      - "fit": dict (the fit tested)
+    """
+    x = _sorted_sample(data)
+    if fit is None:
+        fit = estimate_powerlaw(x, **options)
+
+    n_boot = int(n_boot)
+    if n_boot <= 0:
+        raise ValueError("n_boot must be positive")
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(int(n_jobs), n_boot))
+
+    seed_seqs = np.random.SeedSequence(seed).spawn(n_boot)
+    payload = {"x": x, "fit": fit, "options": options}
+
+    if n_jobs == 1:
+        _init_gof_worker(payload)
+        try:
+            ks_boot = _gof_replicates(seed_seqs)
+        finally:
+            _GOF_WORKER.clear()
+    else:
+        chunks = [seed_seqs[i::n_jobs] for i in range(n_jobs)]
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_gof_worker,
+            initargs=(payload,),
+        ) as pool:
+            parts = list(pool.map(_gof_replicates, chunks))
+        # back to replicate order
+        ks_boot = [None] * n_boot
+        for i, part in enumerate(parts):
+            ks_boot[i::n_jobs] = part
+
+    ks_boot = np.asarray(ks_boot, dtype=float)
+    valid = ks_boot[~np.isnan(ks_boot)]
+    p_value = float(np.mean(valid >= fit["ks"])) if valid.size else np.nan
+
+    return {
+        "p_value": p_value,
+        "ks": float(fit["ks"]),
+        "ks_boot": ks_boot,
+        "fit": fit,
+    }
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import rasterio
+from affine import Affine
+from rasterio.crs import CRS
+
+from .flp20_to_df import _row_windows, _valid_mask
+
+# bump when the on-disk layout changes; older stores are rebuilt
+_STORE_VERSION = 1
+_HASH_CHUNK = 4 * 2**20
+
+
+def _source_key(path):
+    """Cheap identity of a source file: absolute path, size and mtime."""
+    st = os.stat(path)
+    return {
+        "source": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def _content_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _profile_to_json(profile):
+    out = {}
+    for key, value in profile.items():
+        if key == "crs":
+            out[key] = value.to_wkt() if value else None
+        elif key == "transform":
+            out[key] = list(value)[:6]
+        else:
+            out[key] = value
+    return out
+
+
+def _profile_from_json(profile):
+    profile = dict(profile)
+    if profile.get("crs"):
+        profile["crs"] = CRS.from_wkt(profile["crs"])
+    if profile.get("transform") is not None:
+        profile["transform"] = Affine(*profile["transform"])
+    return profile
+
+
+def _store_path(path, cache_dir):
+    """Store directory of a source: one per raster name, rebuilt in place
+    when the source changes (its key is kept in meta.json)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if cache_dir is None:
+        source = os.path.abspath(path)
+        cache_dir = os.path.join(os.path.dirname(source), ".scenfirepy")
+    return os.path.join(cache_dir, stem)
+
+
+def build_event_store(raster, store_path, rows=None):
+    """
+    Extract the events of an FLP20 raster into an on-disk event store.
+
+    The store is a directory holding
+      - sizes.npy    : float64 cell values (event sizes), fire_id order
+      - surfaces.npy : float64 event surfaces (1 per cell)
+      - cells.npy    : int64 flat cell index (row * width + col)
+      - meta.json    : raster profile, grid shape, source key and content hash
+    Events are the valid cells of flp20_to_df, in the same row-major order.
+    The raster is read strip by strip twice (count, then fill), so memory
+    stays bounded; arrays are written through np.lib.format.open_memmap.
+
+    Parameters
+    ----------
+    raster : str
+        Path to the FLP20 raster.
+    store_path : str
+        Directory of the store (replaced if it exists).
+    rows : int | None
+        Rows per strip (defaults to the raster block height).
+
+    Returns
+    -------
+    str -> store_path
+    """
+    parent = os.path.dirname(os.path.abspath(store_path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+
+    try:
+        with rasterio.open(raster) as src:
+            windows = list(_row_windows(src, rows))
+            counts = [
+                np.count_nonzero(_valid_mask(src.read(1, window=w)))
+                for w in windows
+            ]
+            n = int(np.sum(counts))
+            if n == 0:
+                raise ValueError("No valid fire events found in FLP20 raster")
+
+            open_memmap = np.lib.format.open_memmap
+            sizes = open_memmap(
+                os.path.join(tmp, "sizes.npy"), mode="w+", dtype=np.float64,
+                shape=(n,),
+            )
+            cells = open_memmap(
+                os.path.join(tmp, "cells.npy"), mode="w+", dtype=np.int64,
+                shape=(n,),
+            )
+            pos = 0
+            for window in windows:
+                data = src.read(1, window=window)
+                mask = _valid_mask(data)
+                k = np.count_nonzero(mask)
+                sizes[pos:pos + k] = data[mask]
+                cells[pos:pos + k] = (
+                    np.flatnonzero(mask) + window.row_off * src.width
+                )
+                pos += k
+            sizes.flush()
+            cells.flush()
+            del sizes, cells
+
+            surfaces = open_memmap(
+                os.path.join(tmp, "surfaces.npy"), mode="w+",
+                dtype=np.float64, shape=(n,),
+            )
+            surfaces[:] = 1.0
+            surfaces.flush()
+            del surfaces
+
+            meta = dict(
+                _source_key(raster),
+                content_hash=_content_hash(raster),
+                version=_STORE_VERSION,
+                n_events=n,
+                height=src.height,
+                width=src.width,
+                profile=_profile_to_json(src.profile),
+            )
+
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+
+        if os.path.exists(store_path):
+            shutil.rmtree(store_path)
+        os.replace(tmp, store_path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    return store_path
+
+
+def load_event_store(raster, cache_dir=None, rebuild=False, verify=False):
+    """
+    Events of an FLP20 raster from its event store, building it if needed.
+
+    The store is the directory named after the raster in cache_dir. It is
+    used while the source path, size and modification time match those
+    recorded in its meta.json, so repeated runs skip decoding the raster:
+    the arrays are opened as read-only memory maps (np.load(...,
+    mmap_mode="r")). Otherwise it is rebuilt in place, so a raster never
+    has more than one store. The content hash of
+    the source is recorded when the store is built; verify=True re-hashes
+    the source and rebuilds on mismatch (this reads the whole file).
+
+    Parameters
+    ----------
+    raster : str
+        Path to the FLP20 raster, or to an event store directory.
+    cache_dir : str | None
+        Directory holding the stores (default: .scenfirepy next to the
+        raster).
+    rebuild : bool
+        Force re-extraction.
+    verify : bool
+        Check the content hash of the source before using the store.
+
+    Returns
+    -------
+    dict with keys:
+      - "sizes": float64 memmap of event sizes (fire_id order)
+      - "event_surfaces": float64 memmap of event surfaces
+      - "cells": int64 memmap of flat cell indices
+      - "height", "width": int (grid shape)
+      - "profile": dict (raster profile of the source)
+      - "path": str (store directory)
+    The dict can be passed to flp20_to_df and flp20_to_raster in place of
+    the raster.
+    """
+    if os.path.isdir(raster):
+        store_path = raster
+    else:
+        store_path = _store_path(raster, cache_dir)
+        meta_path = os.path.join(store_path, "meta.json")
+
+        fresh = not rebuild and os.path.exists(meta_path)
+        if fresh:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            key = _source_key(raster)
+            fresh = meta.get("version") == _STORE_VERSION and all(
+                meta.get(name) == value for name, value in key.items()
+            )
+            if fresh and verify:
+                fresh = meta.get("content_hash") == _content_hash(raster)
+        if not fresh:
+            build_event_store(raster, store_path)
+
+    with open(os.path.join(store_path, "meta.json")) as f:
+        meta = json.load(f)
+
+    def _load(name):
+        return np.load(os.path.join(store_path, name), mmap_mode="r")
+
+    return {
+        "sizes": _load("sizes.npy"),
+        "event_surfaces": _load("surfaces.npy"),
+        "cells": _load("cells.npy"),
+        "height": int(meta["height"]),
+        "width": int(meta["width"]),
+        "profile": _profile_from_json(meta["profile"]),
+        "path": store_path,
+    }
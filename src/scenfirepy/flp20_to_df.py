@@ -1,6 +1,102 @@
 import numpy as np
 import pandas as pd
 import rasterio
+from rasterio.windows import Window
+
+# events per chunk when streaming from an event store
+_STORE_CHUNK = 2**20
+
+
+def _valid_mask(data):
+    # Mask invalid / non-fire cells (R behavior: remove NA / zero)
+    return np.isfinite(data) & (data > 0)
+
+
+def _row_windows(src, rows=None):
+    """
+    Full-width strips of `rows` rows covering the raster top to bottom.
+
+    By default a strip is one row of blocks of src.block_windows(), so every
+    block is read exactly once. Strips span the whole width because fire_id
+    follows row-major order over the whole raster; with tiled rasters a
+    single tile would interleave with its neighbours.
+    """
+    if rows is None:
+        rows = src.block_shapes[0][0]
+    rows = max(1, int(rows))
+    for row_off in range(0, src.height, rows):
+        yield Window(0, row_off, src.width, min(rows, src.height - row_off))
+
+
+def iter_flp20_df(raster, rows=None):
+    """
+    Stream the valid cells of an FLP20 raster as DataFrame chunks.
+
+    Reads the raster strip by strip (see rows) instead of as a whole, so
+    memory is bounded by one strip plus one chunk. Chunks carry the columns of
+    flp20_to_df with compact dtypes (int32 row/col, int64 fire_id, value in
+    the raster dtype), and fire_id continues across chunks in the same
+    row-major order as flp20_to_df. Strips without valid cells yield nothing.
+
+    Parameters
+    ----------
+    raster : str | rasterio.io.DatasetReader | dict
+        Path to an FLP20 raster, an already-open rasterio dataset, or an
+        event store from load_event_store (chunks of 2**20 events; values are
+        the stored float64 sizes).
+    rows : int | None
+        Rows per strip. Defaults to the block height of the raster.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Columns row, col, fire_id, value for one strip.
+    """
+    if isinstance(raster, str):
+        with rasterio.open(raster) as src:
+            yield from iter_flp20_df(src, rows=rows)
+        return
+
+    if isinstance(raster, dict):
+        cells = raster["cells"]
+        width = raster["width"]
+        for start in range(0, cells.size, _STORE_CHUNK):
+            c = np.asarray(cells[start:start + _STORE_CHUNK])
+            yield pd.DataFrame(
+                {
+                    "row": (c // width).astype(np.int32),
+                    "col": (c % width).astype(np.int32),
+                    "fire_id": np.arange(
+                        start + 1, start + 1 + c.size, dtype=np.int64
+                    ),
+                    "value": np.asarray(
+                        raster["sizes"][start:start + _STORE_CHUNK]
+                    ),
+                }
+            )
+        return
+
+    next_id = 1
+    for window in _row_windows(raster, rows):
+        data = raster.read(1, window=window)
+        mask = _valid_mask(data)
+
+        rows_w, cols_w = np.nonzero(mask)
+        if rows_w.size == 0:
+            continue
+
+        values = data[mask]
+        yield pd.DataFrame(
+            {
+                "row": (rows_w + window.row_off).astype(np.int32),
+                "col": cols_w.astype(np.int32),
+                "fire_id": np.arange(
+                    next_id, next_id + values.size, dtype=np.int64
+                ),
+                "value": values,
+            }
+        )
+        next_id += values.size
 
 
 def flp20_to_df(raster):
@@ -9,8 +105,9 @@ def flp20_to_df(raster):
 
     Parameters
     ----------
-    raster : str | rasterio.io.DatasetReader
-        Path to an FLP20 raster or an already-open rasterio dataset.
+    raster : str | rasterio.io.DatasetReader | dict
+        Path to an FLP20 raster, an already-open rasterio dataset, or an
+        event store from load_event_store.
 
     Returns
     -------
@@ -20,36 +117,19 @@ def flp20_to_df(raster):
         - col
         - fire_id
         - value
-    """
-
-    # Open raster if a path is provided
-    if isinstance(raster, str):
-        with rasterio.open(raster) as src:
-            data = src.read(1)
-    else:
-        data = raster.read(1)
-
-    if data.ndim != 2:
-        raise ValueError("FLP20 raster must be 2D")
 
-    data = np.asarray(data)
+    The raster is read strip by strip (see iter_flp20_df), so the full grid
+    is never held in memory; use iter_flp20_df directly to also avoid holding
+    the whole table.
+    """
 
-    # Mask invalid / non-fire cells (R behavior: remove NA / zero)
-    mask = np.isfinite(data) & (data > 0)
+    chunks = list(iter_flp20_df(raster))
 
-    if not np.any(mask):
+    if not chunks:
         raise ValueError("No valid fire events found in FLP20 raster")
 
-    rows, cols = np.where(mask)
-    values = data[mask]
-
-    df = pd.DataFrame(
-        {
-            "row": rows,
-            "col": cols,
-            "fire_id": np.arange(1, len(values) + 1),
-            "value": values,
-        }
-    )
+    df = pd.concat(chunks, ignore_index=True)
+    df["row"] = df["row"].astype(np.int64)
+    df["col"] = df["col"].astype(np.int64)
 
     return df
@@ -1,24 +1,182 @@
 import numpy as np
 import rasterio
 from rasterio.enums import Resampling
+from rasterio.windows import Window
+
+from .flp20_to_df import _valid_mask
+
+
+def _check_block_size(block_size):
+    """GeoTIFF tiles are a positive multiple of 16 pixels wide and high."""
+    if (
+        isinstance(block_size, bool)
+        or not isinstance(block_size, (int, np.integer))
+        or block_size <= 0
+        or block_size % 16
+    ):
+        raise ValueError("block_size must be a positive multiple of 16")
+    return int(block_size)
+
+
+def _tiled_profile(profile, compress, block_size):
+    """Creation options of the tiled float32 output."""
+    profile = dict(profile)
+    profile.update(
+        driver="GTiff",
+        tiled=True,
+        blockxsize=block_size,
+        blockysize=block_size,
+        BIGTIFF="IF_SAFER",
+    )
+    for key in ("compress", "predictor", "interleave", "photometric"):
+        profile.pop(key, None)
+    if compress is not None:
+        profile.update(compress=compress, predictor=3)
+    return profile
+
+
+def _sorted_pairs(event_index, bp, n_events):
+    """Validate (event index, value) pairs and sort them by event index."""
+    idx = np.asarray(event_index, dtype=np.int64)
+    if idx.ndim != 1 or idx.size != bp.size:
+        raise ValueError("event_index must be 1D and match burn_probability")
+
+    order = np.argsort(idx, kind="stable")
+    idx = idx[order]
+    if idx.size and (idx[0] < 0 or idx[-1] >= n_events):
+        raise ValueError("event_index out of range of fire cells in raster")
+    if np.any(idx[1:] == idx[:-1]):
+        raise ValueError("event_index must not contain duplicates")
+
+    return idx, bp[order]
+
+
+def _tile_windows(height, width, block_size):
+    """Windows of the block_size tiles of one block row after another."""
+    for row_off in range(0, height, block_size):
+        rows = min(block_size, height - row_off)
+        for col_off in range(0, width, block_size):
+            yield Window(
+                col_off, row_off, min(block_size, width - col_off), rows
+            )
+
+
+def _write_tiles(output_path, profile, tiles):
+    """Write (window, flat cell positions, values) tiles to a GeoTIFF."""
+    with rasterio.open(output_path, "w", **profile) as dst:
+        for window, pos, values in tiles:
+            block = np.zeros((window.height, window.width), dtype="float32")
+            block.flat[pos] = values
+            dst.write(block, 1, window=window)
+
+
+def _fill(out, tiles):
+    """In-memory counterpart of _write_tiles."""
+    for window, pos, values in tiles:
+        rows = slice(window.row_off, window.row_off + window.height)
+        cols = slice(window.col_off, window.col_off + window.width)
+        block = out[rows, cols]
+        block[np.unravel_index(pos, block.shape)] = values
+    return out
+
+
+def _store_to_raster(store, burn_probability, output_path, compress,
+                     block_size, event_index):
+    """flp20_to_raster for an event store: cells come from store["cells"]."""
+    cells = store["cells"]
+    height = store["height"]
+    width = store["width"]
+
+    bp = np.asarray(burn_probability)
+    if bp.ndim != 1:
+        raise ValueError("burn_probability must be a 1D array")
+
+    if event_index is None:
+        if bp.size != cells.size:
+            raise ValueError(
+                "burn_probability length must match number of fire cells in raster"
+            )
+    else:
+        idx, bp = _sorted_pairs(event_index, bp, cells.size)
+        # cells are sorted, so sorted events map to sorted cells
+        cells = np.asarray(cells[idx])
+
+    profile = dict(store["profile"])
+    profile.update(dtype="float32", count=1, nodata=0.0)
+
+    if output_path is None:
+        out = np.zeros((height, width), dtype=float)
+        out.flat[np.asarray(cells)] = bp
+        return out, profile
+
+    def tiles():
+        for row_off in range(0, height, block_size):
+            rows = min(block_size, height - row_off)
+            # the block row is one contiguous slice of the sorted cells
+            lo, hi = np.searchsorted(
+                cells, [row_off * width, (row_off + rows) * width]
+            )
+            if event_index is not None and lo == hi:
+                continue
+            strip = cells[lo:hi]
+            row_starts = (row_off + np.arange(rows)) * width
+            for col_off in range(0, width, block_size):
+                cols = min(block_size, width - col_off)
+                # cells of the tile: one slice of the strip per row
+                a = np.searchsorted(strip, row_starts + col_off)
+                b = np.searchsorted(strip, row_starts + col_off + cols)
+                counts = b - a
+                total = int(counts.sum())
+                if event_index is not None and total == 0:
+                    continue
+                ids = np.repeat(a - np.cumsum(counts) + counts, counts)
+                ids += np.arange(total)
+                cell = np.asarray(strip[ids])
+                pos = (cell // width - row_off) * cols + cell % width - col_off
+                yield (
+                    Window(col_off, row_off, cols, rows), pos, bp[lo + ids]
+                )
+
+    profile = _tiled_profile(profile, compress, block_size)
+    if event_index is not None:
+        profile.update(sparse_ok=True)
+    _write_tiles(output_path, profile, tiles())
+
+    return output_path
 
 
 def flp20_to_raster(
     reference_raster,
     burn_probability,
     output_path=None,
+    compress="deflate",
+    block_size=256,
+    event_index=None,
 ):
     """
     Literal port of SCENFIRE R::flp20_to_raster()
 
     Parameters
     ----------
-    reference_raster : str | rasterio.io.DatasetReader
-        FLP20 raster used as spatial reference (grid, transform, CRS).
+    reference_raster : str | rasterio.io.DatasetReader | dict
+        FLP20 raster used as spatial reference (grid, transform, CRS), or an
+        event store from load_event_store (the raster is then not read).
     burn_probability : array-like
-        Burn probability values aligned with FLP20 fire_id order.
+        Burn probability values aligned with FLP20 fire_id order, or with
+        event_index when given.
     output_path : str | None
         If provided, writes GeoTIFF to this path. If None, returns array + profile.
+    compress : str | None
+        GeoTIFF compression of the output ("deflate", "zstd", "lzw" or None).
+        Compressed output uses the floating-point predictor.
+    block_size : int
+        Tile size of the output, in pixels (multiple of 16).
+    event_index : array-like (int) | None
+        Sparse input: 0-based event indices (fire_id - 1, e.g. the
+        "surface_index" of select_events) of the values in burn_probability;
+        all other cells are 0. Only tiles holding one of these events are
+        written; untouched tiles are left sparse in the GeoTIFF and read as
+        nodata (0).
 
     Returns
     -------
@@ -26,8 +184,24 @@ def flp20_to_raster(
         (np.ndarray, dict) -> (burn probability raster, raster profile)
     Else:
         str -> output_path
+
+    The reference raster is processed in block_size tiles. A first pass
+    counts the fire cells of every row; their cumulative sum gives the
+    fire_id of the first fire cell of each row, and with the cells of the
+    same rows in the tiles to its left, the fire_id of every cell of a
+    tile. The GeoTIFF is then written tile by tile as tiled float32, so
+    besides burn_probability, memory is a few tiles and one integer per
+    row whatever the raster size.
     """
 
+    block_size = _check_block_size(block_size)
+
+    if isinstance(reference_raster, dict):
+        return _store_to_raster(
+            reference_raster, burn_probability, output_path, compress,
+            block_size, event_index,
+        )
+
     # Open raster
     if isinstance(reference_raster, str):
         src = rasterio.open(reference_raster)
@@ -37,38 +211,82 @@ def flp20_to_raster(
         close_src = False
 
     try:
-        data = src.read(1)
         profile = src.profile.copy()
-    finally:
-        if close_src:
-            src.close()
 
-    if data.ndim != 2:
-        raise ValueError("reference_raster must be 2D")
+        bp = np.asarray(burn_probability)
+        if bp.ndim != 1:
+            raise ValueError("burn_probability must be a 1D array")
 
-    bp = np.asarray(burn_probability, dtype=float)
+        height, width = src.height, src.width
 
-    # Mask fire cells (same rule used in flp20_to_df)
-    mask = np.isfinite(data) & (data > 0)
+        # Fire cells per row (same rule used in flp20_to_df), read tile by
+        # tile; row_start[r] is the event index of the first fire cell of
+        # row r, as fire_id follows row-major order
+        row_counts = np.zeros(height, dtype=np.int64)
+        for window in _tile_windows(height, width, block_size):
+            mask = _valid_mask(src.read(1, window=window))
+            rows = slice(window.row_off, window.row_off + window.height)
+            row_counts[rows] += np.count_nonzero(mask, axis=1)
+        row_start = np.concatenate([[0], np.cumsum(row_counts)])
+        n_events = int(row_start[-1])
 
-    if bp.size != np.count_nonzero(mask):
-        raise ValueError(
-            "burn_probability length must match number of fire cells in raster"
-        )
+        if event_index is None:
+            if bp.size != n_events:
+                raise ValueError(
+                    "burn_probability length must match number of fire cells in raster"
+                )
+        else:
+            idx, bp = _sorted_pairs(event_index, bp, n_events)
 
-    # Create output raster
-    out = np.zeros_like(data, dtype=float)
-    out[mask] = bp
+        def tiles():
+            for row_off in range(0, height, block_size):
+                rows = min(block_size, height - row_off)
+                first = row_start[row_off:row_off + rows]
+                if event_index is not None:
+                    # pairs falling in this block row
+                    lo, hi = np.searchsorted(
+                        idx, [first[0], row_start[row_off + rows]]
+                    )
+                    if lo == hi:
+                        continue
+                    block_idx, block_bp = idx[lo:hi], bp[lo:hi]
+                # fire cells of each row left of the current tile
+                left = first.copy()
+                for col_off in range(0, width, block_size):
+                    window = Window(
+                        col_off, row_off, min(block_size, width - col_off),
+                        rows,
+                    )
+                    mask = _valid_mask(src.read(1, window=window))
+                    ids = (left[:, None] + np.cumsum(mask, axis=1) - 1)[mask]
+                    left += np.count_nonzero(mask, axis=1)
+                    pos = np.flatnonzero(mask)
+                    if event_index is None:
+                        yield window, pos, bp[ids]
+                        continue
+                    at = np.searchsorted(block_idx, ids)
+                    at = np.minimum(at, block_idx.size - 1)
+                    hit = block_idx[at] == ids
+                    if hit.any():
+                        yield window, pos[hit], block_bp[at[hit]]
 
-    profile.update(
-        dtype="float32",
-        count=1,
-        nodata=0.0,
-    )
+        profile.update(
+            dtype="float32",
+            count=1,
+            nodata=0.0,
+        )
+
+        if output_path is None:
+            # Create output raster
+            out = np.zeros((height, width), dtype=float)
+            return _fill(out, tiles()), profile
 
-    if output_path is not None:
-        with rasterio.open(output_path, "w", **profile) as dst:
-            dst.write(out.astype("float32"), 1)
-        return output_path
+        profile = _tiled_profile(profile, compress, block_size)
+        if event_index is not None:
+            profile.update(sparse_ok=True)
+        _write_tiles(output_path, profile, tiles())
+    finally:
+        if close_src:
+            src.close()
 
-    return out, profile
+    return output_path
@@ -0,0 +1,265 @@
+# src/scenfirepy/parallel.py
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .selection import select_events
+
+# per-process inputs, set once by _init_worker instead of pickled per task
+_WORKER = {}
+
+# restart status for each select_events stop_reason
+_STATUS = {
+    "max_it": "done", "callback": "cancelled", "time_budget": "deadline",
+}
+
+# select_events options that cannot be shared by concurrent restarts
+_UNSUPPORTED = ("callback", "checkpoint", "resume_from", "cache")
+
+
+def _init_worker(data, stop):
+    _WORKER["data"] = data
+    _WORKER["stop"] = stop
+
+
+def _run_restart(restart, seed_seq):
+    """
+    Run one restart as a single select_events call on its own generator.
+
+    Every check_every attempts the restart gives up (through the
+    select_events callback) if a restart with a lower index has already
+    reached the tolerance: its result could not be kept anyway. Such a
+    restart, or one that has not started by the deadline, is not run at all.
+    """
+    data = _WORKER["data"]
+    stop = _WORKER["stop"]
+    kwargs = data["kwargs"]
+    deadline = kwargs.get("deadline")
+    check_every = data["check_every"]
+
+    def cancelled(stats):
+        return stats["attempt"] % check_every == 0 and restart > stop.value
+
+    t0 = time.perf_counter()
+    best = None
+    status = "deadline"
+    attempts = 0
+
+    if restart > stop.value:
+        status = "cancelled"
+    elif deadline is None or time.time() < deadline:
+        best = select_events(**dict(
+            kwargs, seed=np.random.default_rng(seed_seq), callback=cancelled,
+        ))
+        attempts = best["attempts"]
+        status = _STATUS.get(best["stop_reason"], best["stop_reason"])
+        if status == "tolerance":
+            with stop.get_lock():
+                stop.value = min(stop.value, restart)
+
+    stats = _restart_stats(restart, status, attempts, best)
+    stats["elapsed"] = time.perf_counter() - t0
+    stats["pid"] = os.getpid()
+    return restart, best, stats
+
+
+def _restart_stats(restart, status, attempts=0, best=None):
+    return {
+        "restart": restart,
+        "status": status,
+        "attempts": attempts,
+        "discrepancy": np.inf if best is None else best["discrepancy"],
+        "n_events": 0 if best is None else int(best["surface_index"].size),
+        "total_surface": 0.0 if best is None else best["total_surface"],
+        "elapsed": 0.0,
+        "pid": None,
+    }
+
+
+def select_events_parallel(
+    event_sizes,
+    event_probabilities,
+    target_hist,
+    bins,
+    reference_surface,
+    surface_threshold,
+    tolerance,
+    iter_limit,
+    max_it,
+    seed=None,
+    n_restarts=10,
+    n_jobs=None,
+    check_every=10,
+    time_budget=None,
+    deadline=None,
+    **kwargs,
+):
+    """
+    Run independent restarts of select_events on several cores and keep the
+    best one.
+
+    Replaces the manual `for i in range(10): seed=123 + i` loop. Restart i runs
+    select_events with its own stream, np.random.SeedSequence(seed).spawn(
+    n_restarts)[i], in a ProcessPoolExecutor. The streams depend only on seed
+    and n_restarts, so the result is bit-identical whatever the number of
+    workers.
+
+    Parameters
+    ----------
+    event_sizes ... max_it : as in select_events
+    seed : int | None (root seed of the restart streams)
+    n_restarts : int (number of independent restarts, default 10)
+    n_jobs : int | None (worker processes; None = os.cpu_count(), 1 = run in
+        this process without a pool)
+    check_every : int (attempts between checks of the stop signal)
+    time_budget, deadline : float | None (wall-clock limit of the whole
+        call, as in select_events; turned into one deadline shared by all
+        restarts, which stop at it and are not started after it)
+    **kwargs : further select_events options (e.g. method, memory_budget,
+        refine, patience); callback, checkpoint, resume_from and cache are
+        not supported
+
+    Once restart i reaches the tolerance, restarts with a higher index are
+    cancelled (pending ones are never started, running ones stop at their next
+    check) and only restarts 0..i compete for the global best, exactly as if
+    the restarts had run one after the other. Ties go to the lowest restart.
+
+    Returns
+    -------
+    dict with the keys of select_events for the global best, plus:
+      - "restart": int (index of the restart that produced it)
+      - "restarts": list of per-restart stats dicts ("restart", "status"
+        in {"done", "tolerance", "converged", "deadline", "cancelled"},
+        "attempts", "discrepancy", "n_events", "total_surface", "elapsed",
+        "pid")
+    "attempts" is the total over the restarts kept and "stop_reason" is
+    "tolerance", "time_budget", "deadline" or "max_it" for the call as a
+    whole ("time_budget" or "deadline" after the parameter that set the
+    shared deadline, as in select_events).
+    """
+    n_restarts = int(n_restarts)
+    if n_restarts <= 0:
+        raise ValueError("n_restarts must be positive")
+    if int(check_every) <= 0:
+        raise ValueError("check_every must be positive")
+    unsupported = [name for name in _UNSUPPORTED if name in kwargs]
+    if unsupported:
+        raise ValueError(
+            f"select_events_parallel does not support {', '.join(unsupported)}"
+        )
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(int(n_jobs), n_restarts))
+
+    if max_it is None and time_budget is None and deadline is None:
+        raise ValueError("max_it=None requires time_budget or deadline")
+    # which parameter sets the shared deadline, as in select_events
+    time_reason = "deadline"
+    if time_budget is not None:
+        until = time.time() + float(time_budget)
+        if deadline is None or until < deadline:
+            deadline = until
+            time_reason = "time_budget"
+
+    seed_seqs = np.random.SeedSequence(seed).spawn(n_restarts)
+
+    data = {
+        "kwargs": dict(
+            kwargs,
+            event_sizes=np.asarray(event_sizes, dtype=float),
+            event_probabilities=np.asarray(event_probabilities, dtype=float),
+            target_hist=np.asarray(target_hist, dtype=float),
+            bins=np.asarray(bins, dtype=float),
+            reference_surface=reference_surface,
+            surface_threshold=surface_threshold,
+            tolerance=tolerance,
+            iter_limit=iter_limit,
+            max_it=max_it,
+            deadline=deadline,
+        ),
+        "check_every": int(check_every),
+    }
+
+    ctx = mp.get_context()
+    # lowest restart index that reached the tolerance (n_restarts = none yet)
+    stop = ctx.Value("q", n_restarts)
+
+    results = {}
+    if n_jobs == 1:
+        _init_worker(data, stop)
+        try:
+            for restart, seed_seq in enumerate(seed_seqs):
+                results[restart] = _run_restart(restart, seed_seq)[1:]
+        finally:
+            _WORKER.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(data, stop),
+        ) as pool:
+            futures = {
+                pool.submit(_run_restart, restart, seed_seq): restart
+                for restart, seed_seq in enumerate(seed_seqs)
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                restart, best, stats = future.result()
+                results[restart] = (best, stats)
+                if stats["status"] == "tolerance":
+                    for other, r in futures.items():
+                        if r > stop.value:
+                            other.cancel()
+
+    stop_at = stop.value
+    restarts = []
+    best_restart = None
+    best = None
+    attempts = 0
+    for restart in range(n_restarts):
+        if restart in results:
+            res, stats = results[restart]
+        else:
+            res, stats = None, _restart_stats(restart, "cancelled")
+        if restart > stop_at:
+            # would not have run sequentially: never part of the result
+            stats["status"] = "cancelled"
+            res = None
+        restarts.append(stats)
+        if res is not None:
+            attempts += stats["attempts"]
+
+        if res is not None and (
+            best is None or res["discrepancy"] < best["discrepancy"]
+        ):
+            best = res
+            best_restart = restart
+
+    if best is None:
+        best = {
+            "surface_index": np.array([], dtype=int),
+            "events": np.array([], dtype=float),
+            "discrepancy": float(np.inf),
+            "total_surface": 0.0,
+        }
+
+    if stop_at < n_restarts:
+        stop_reason = "tolerance"
+    elif any(stats["status"] == "deadline" for stats in restarts):
+        stop_reason = time_reason
+    else:
+        stop_reason = "max_it"
+
+    return dict(
+        best,
+        restart=best_restart,
+        restarts=restarts,
+        attempts=attempts,
+        stop_reason=stop_reason,
+    )
@@ -1,19 +1,29 @@
 def get_select_params(
-    xmin,
-    alpha,
+    xmin=None,
+    alpha=None,
     num_bins=20,
     logaritmic=True,
     max_iter=1000,
     tol=1e-6,
     seed=None,
+    fit=None,
 ):
     """
     Literal implementation of SCENFIRE R::get_select_params (from Rd).
 
     Collects and validates parameters for select_events.
     Returns a dictionary of validated parameters.
+
+    fit is an optional power-law fit (the dict of estimate_powerlaw); it
+    supplies xmin and alpha when they are not given.
     """
 
+    if fit is not None:
+        if xmin is None:
+            xmin = fit["xmin"]
+        if alpha is None:
+            alpha = fit["alpha"]
+
     if xmin is None or xmin <= 0:
         raise ValueError("xmin must be a positive number")
 
@@ -1,5 +1,28 @@
 import numpy as np
 
+from .streaming import _CHUNK, _chunks, _map_parts, _merge_summaries, _parts
+from .streaming import _summary
+
+
+def _assess(max_hist, total_hist, max_sim, total_sim):
+    """Sufficiency verdict of check_fire_data as (sufficient, reason,
+    max_surface_threshold, recommended_surface_threshold)."""
+    if max_sim < max_hist:
+        return False, "Simulated fires too small.", None, None
+
+    if total_sim < total_hist:
+        return False, "Insufficient total burned area.", None, None
+
+    max_surface_threshold = int(max_sim)
+    recommended_surface_threshold = int(max_surface_threshold * 0.1)
+    return (
+        True,
+        "Sufficient simulated perimeters and burned area.",
+        max_surface_threshold,
+        recommended_surface_threshold,
+    )
+
+
 def check_fire_data(fires_hist_size, sim_perimeters_size, n_years):
     fires_hist_size = np.asarray(fires_hist_size, dtype=float)
     sim_perimeters_size = np.asarray(sim_perimeters_size, dtype=float)
@@ -13,19 +36,76 @@ def check_fire_data(fires_hist_size, sim_perimeters_size, n_years):
     total_hist = fires_hist_size.sum()
     total_sim = sim_perimeters_size.sum()
 
-    if max_sim < max_hist:
-        print("Simulated fires too small.")
-        return None
+    sufficient, reason, max_surface_threshold, recommended_surface_threshold = (
+        _assess(max_hist, total_hist, max_sim, total_sim)
+    )
 
-    if total_sim < total_hist:
-        print("Insufficient total burned area.")
+    print(reason)
+    if not sufficient:
         return None
 
-    max_surface_threshold = int(max_sim)
-    recommended_surface_threshold = int(max_surface_threshold * 0.1)
-
-    print("Sufficient simulated perimeters and burned area.")
     print("Maximum surface threshold:", max_surface_threshold)
     print("Recommended surface threshold:", recommended_surface_threshold)
 
     return recommended_surface_threshold
+
+
+def check_fire_data_chunked(fires_hist_size, sim_perimeters_size,
+                            n_years=None, chunk_size=_CHUNK, n_jobs=1):
+    """
+    Out-of-core check_fire_data for size vectors spread over many chunks or
+    files, returning a report instead of printing.
+
+    Each input is reduced to its count, sum and maximum in one pass over
+    its chunks; parts (array slices, files) are reduced in a thread pool
+    and the partial results merged. The verdict is that of check_fire_data.
+
+    Parameters
+    ----------
+    fires_hist_size : array | memmap | .npy path | list of those | callable
+        | iterable (observed fire sizes; see scenfirepy.streaming)
+    sim_perimeters_size : same kinds (simulated fire sizes, e.g. one .npy
+        file per simulation)
+    n_years : unused (kept for parity with check_fire_data)
+    chunk_size : int (values per chunk)
+    n_jobs : int | None (threads; None = os.cpu_count())
+
+    Returns
+    -------
+    dict with keys:
+      - "hist", "sim": dicts with "count", "sum" and "max" of each input
+      - "sufficient": bool
+      - "reason": str (the message check_fire_data prints)
+      - "max_surface_threshold": int | None
+      - "recommended_surface_threshold": int | None (the value
+        check_fire_data returns)
+    """
+    chunk_size = int(chunk_size)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    hist_parts = _parts(fires_hist_size, chunk_size)
+    sim_parts = _parts(sim_perimeters_size, chunk_size)
+    summaries = _map_parts(
+        lambda part: _summary(_chunks(part, chunk_size)),
+        hist_parts + sim_parts,
+        n_jobs,
+    )
+    hist = _merge_summaries(summaries[:len(hist_parts)])
+    sim = _merge_summaries(summaries[len(hist_parts):])
+
+    if hist["count"] == 0 or sim["count"] == 0:
+        raise ValueError("Empty fire size vectors.")
+
+    sufficient, reason, max_surface_threshold, recommended_surface_threshold = (
+        _assess(hist["max"], hist["sum"], sim["max"], sim["sum"])
+    )
+
+    return {
+        "hist": hist,
+        "sim": sim,
+        "sufficient": sufficient,
+        "reason": reason,
+        "max_surface_threshold": max_surface_threshold,
+        "recommended_surface_threshold": recommended_surface_threshold,
+    }
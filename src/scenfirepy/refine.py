@@ -0,0 +1,246 @@
+# src/scenfirepy/refine.py
+import math
+
+import numpy as np
+
+from .distribution import _bin_index, _density
+
+# number of random proposals drawn from the generator at a time
+_MOVE_BLOCK = 4096
+
+
+def refine_selection(
+    surface_index,
+    event_sizes,
+    event_probabilities,
+    target_hist,
+    bins,
+    surface_threshold,
+    n_moves=10_000,
+    temperature=0.0,
+    cooling=0.999,
+    max_overshoot=None,
+    seed=None,
+):
+    """
+    Local-search refinement of a selection (e.g. the best of select_events).
+
+    Starting from surface_index, applies random moves and keeps those that
+    lower the L1 discrepancy (greedy, temperature=0) or passes them through a
+    simulated-annealing acceptance test (temperature > 0, multiplied by
+    cooling after every move). Moves are:
+      - swap   : replace a selected event by an unselected one
+      - add    : add an unselected event
+      - remove : drop a selected event
+    Events entering the selection are proposed with probability proportional
+    to event_probabilities, events leaving it uniformly.
+
+    Per-bin counts are kept up to date, so a swap within the in-bin events
+    changes two histogram terms and is scored in O(1); moves that change the
+    number of in-bin events rescore the n_bins terms.
+
+    Parameters
+    ----------
+    surface_index : array-like (int indices of the starting selection)
+    event_sizes : array-like (simulated event areas)
+    event_probabilities : array-like (per-event sampling weights, >=0)
+    target_hist : array-like (target histogram density)
+    bins : array-like (bin edges for histogram, length = len(target_hist)+1)
+    surface_threshold : float (lower bound on the accumulated surface)
+    n_moves : int (number of proposed moves)
+    temperature : float (initial annealing temperature; 0 = greedy)
+    cooling : float (temperature multiplier applied after each move)
+    max_overshoot : float | None (accumulated surface may exceed
+        surface_threshold by at most this much; default: the largest size in
+        the starting selection, i.e. about one event, as when sampling stops
+        at the threshold)
+    seed : int | np.random.Generator | None (rng seed)
+
+    A starting selection outside these surface bounds keeps its own total as
+    the bound it violates, so refinement never moves it further away.
+
+    Returns
+    -------
+    dict with keys:
+      - "surface_index": numpy int array of refined event indices
+      - "events": numpy array of selected event sizes
+      - "discrepancy": float (discrepancy of the refined selection)
+      - "total_surface": float (sum sizes of selected events)
+      - "accepted": int (number of accepted moves)
+    """
+    rng = np.random.default_rng(seed)
+
+    sizes = np.asarray(event_sizes, dtype=float)
+    probs = np.asarray(event_probabilities, dtype=float)
+    target_hist = np.asarray(target_hist, dtype=float)
+    bins = np.asarray(bins, dtype=float)
+    start = np.asarray(surface_index, dtype=int)
+
+    if sizes.size == 0:
+        raise ValueError("No event_sizes provided.")
+    n = sizes.size
+
+    if bins.size != target_hist.size + 1:
+        raise ValueError("bins length must be len(target_hist) + 1")
+
+    if start.size == 0:
+        raise ValueError("surface_index must select at least one event")
+
+    if np.unique(start).size != start.size:
+        raise ValueError("surface_index must not contain duplicates")
+
+    # sanitize probabilities (as in select_events)
+    probs = np.nan_to_num(probs, nan=0.0)
+    if probs.sum() <= 0:
+        probs = np.ones_like(probs, dtype=float)
+    cdf = np.cumsum(probs)
+
+    widths = np.diff(bins)
+    n_bins = widths.size
+    bin_index = _bin_index(sizes, bins)
+
+    # python scalars: every move touches a handful of them
+    w = widths.tolist()
+    t = target_hist.tolist()
+    ev_bin = bin_index
+    ev_size = sizes
+
+    # selection as a list plus each event's position in it (-1 = not in)
+    sel = start.tolist()
+    pos = np.full(n, -1, dtype=np.intp)
+    pos[start] = np.arange(start.size)
+
+    counts = np.bincount(bin_index[start], minlength=n_bins + 1).tolist()
+    n_in = sum(counts[:n_bins])
+    total = float(np.sum(sizes[start]))
+
+    if max_overshoot is None:
+        max_overshoot = float(sizes[start].max())
+    lo = min(float(surface_threshold), total)
+    hi = max(float(surface_threshold) + float(max_overshoot), total)
+
+    def term(b, c, m):
+        return abs(c / w[b] / m - t[b])
+
+    def full_disc(cnt, m):
+        if m == 0:
+            return math.inf
+        return sum(abs(cnt[b] / w[b] / m - t[b]) for b in range(n_bins))
+
+    def add(e):
+        pos[e] = len(sel)
+        sel.append(e)
+
+    def drop(e):
+        p = pos[e]
+        last = sel.pop()
+        if last != e:
+            sel[p] = last
+            pos[last] = p
+        pos[e] = -1
+
+    disc = full_disc(counts, n_in)
+    best_disc = disc
+    log = []  # accepted moves as (event out, event in), -1 = none
+    best_len = 0
+    temp = float(temperature)
+
+    for block in range(0, int(n_moves), _MOVE_BLOCK):
+        m = min(_MOVE_BLOCK, int(n_moves) - block)
+        kinds = rng.random(m)
+        outs = rng.random(m)
+        ins = np.searchsorted(cdf, rng.random(m) * cdf[-1], side="right")
+        ins = np.minimum(ins, n - 1).tolist()
+        accept_u = rng.random(m).tolist()
+        kinds = kinds.tolist()
+        outs = outs.tolist()
+
+        for k in range(m):
+            kind = kinds[k]
+            e_out = -1
+            e_in = -1
+            if kind < 0.8:
+                e_out = sel[int(outs[k] * len(sel))]
+                e_in = ins[k]
+            elif kind < 0.9:
+                e_in = ins[k]
+            elif len(sel) > 1:
+                e_out = sel[int(outs[k] * len(sel))]
+            else:
+                temp *= cooling
+                continue
+
+            if e_in >= 0 and pos[e_in] >= 0:
+                # proposed event is already selected
+                temp *= cooling
+                continue
+
+            new_total = total
+            if e_out >= 0:
+                new_total -= ev_size[e_out]
+            if e_in >= 0:
+                new_total += ev_size[e_in]
+            if new_total < lo or new_total > hi:
+                temp *= cooling
+                continue
+
+            b_out = ev_bin[e_out] if e_out >= 0 else n_bins
+            b_in = ev_bin[e_in] if e_in >= 0 else n_bins
+            new_n = n_in - (b_out < n_bins) + (b_in < n_bins)
+
+            if b_out == b_in:
+                new_disc = disc
+            elif new_n == n_in:
+                # swap between two in-bin events: two terms change
+                new_disc = (
+                    disc
+                    - term(b_out, counts[b_out], n_in)
+                    - term(b_in, counts[b_in], n_in)
+                    + term(b_out, counts[b_out] - 1, n_in)
+                    + term(b_in, counts[b_in] + 1, n_in)
+                )
+            else:
+                counts[b_out] -= 1
+                counts[b_in] += 1
+                new_disc = full_disc(counts, new_n)
+                counts[b_out] += 1
+                counts[b_in] -= 1
+
+            delta = new_disc - disc
+            if delta <= 0 or (
+                temp > 0 and accept_u[k] < math.exp(-delta / temp)
+            ):
+                if e_out >= 0:
+                    drop(e_out)
+                if e_in >= 0:
+                    add(e_in)
+                counts[b_out] -= 1
+                counts[b_in] += 1
+                n_in = new_n
+                total = new_total
+                disc = new_disc
+                log.append((e_out, e_in))
+                if disc < best_disc:
+                    best_disc = disc
+                    best_len = len(log)
+
+            temp *= cooling
+
+    # roll back the accepted moves made after the best state
+    for e_out, e_in in reversed(log[best_len:]):
+        if e_in >= 0:
+            drop(e_in)
+        if e_out >= 0:
+            add(e_out)
+
+    best_idx = np.array(sel, dtype=int)
+    best_counts = np.bincount(bin_index[best_idx], minlength=n_bins + 1)
+    hist = _density(best_counts[:n_bins], widths)
+
+    return {
+        "surface_index": best_idx,
+        "events": sizes[best_idx],
+        "discrepancy": float(np.sum(np.abs(hist - target_hist))),
+        "total_surface": float(np.sum(sizes[best_idx])),
+        "accepted": len(log),
+    }
@@ -0,0 +1,619 @@
+# src/scenfirepy/sampling.py
+"""
+Sampling engines used by select_events.
+
+Each engine runs one attempt: it draws events without replacement, with
+probability proportional to their weight among the events still available,
+until the accumulated surface reaches the threshold or the pick limit is hit.
+It returns the selected indices in pick order and the per-bin counts of the
+selection (bin_index holds the precomputed bin of every event, n_bins marking
+events outside the bins; counts has n_bins + 1 slots, the last one for them).
+"""
+import numpy as np
+
+from .distribution import _density
+
+# number of uniforms drawn from the generator at a time by the tree engine
+_DRAW_BLOCK = 1024
+
+
+class _SumTree:
+    """
+    Binary sum-tree over non-negative weights.
+
+    Leaves hold the event weights and every internal node the sum of its two
+    children, so a weighted draw and the removal of a drawn event both cost
+    O(log n). Internal nodes are recomputed from their children on removal
+    (never decremented), so removed mass does not leave rounding residue.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=float)
+        size = 1
+        while size < weights.size:
+            size *= 2
+
+        tree = np.zeros(2 * size, dtype=float)
+        tree[size:size + weights.size] = weights
+
+        # build internal levels bottom-up
+        lo = size
+        while lo > 1:
+            tree[lo // 2:lo] = tree[lo:2 * lo:2] + tree[lo + 1:2 * lo:2]
+            lo //= 2
+
+        self.size = size
+        self.tree = tree
+
+    def copy(self):
+        new = _SumTree.__new__(_SumTree)
+        new.size = self.size
+        new.tree = self.tree.copy()
+        return new
+
+    def total(self):
+        return float(self.tree[1])
+
+    def draw(self, u):
+        """Return the leaf index hit by u in [0, 1) scaled to the total mass."""
+        tree = self.tree
+        size = self.size
+        x = u * tree[1]
+        i = 1
+        while i < size:
+            left = tree[2 * i]
+            # fall back to the left child if rounding pushed x past the
+            # mass of a right subtree that is already empty
+            if x < left or tree[2 * i + 1] <= 0.0:
+                i = 2 * i
+            else:
+                x -= left
+                i = 2 * i + 1
+        return i - size
+
+    def remove(self, idx):
+        """Set the weight of leaf idx to zero and refresh its ancestors."""
+        tree = self.tree
+        i = idx + self.size
+        tree[i] = 0.0
+        i //= 2
+        while i >= 1:
+            tree[i] = tree[2 * i] + tree[2 * i + 1]
+            i //= 2
+
+
+def _draw_legacy(
+    rng, sizes, probs, surface_threshold, iter_limit, bin_index, n_bins
+):
+    """
+    Original per-pick engine: renormalize over the available events and call
+    rng.choice for every pick (O(n) per pick). Kept so that results for a given
+    seed stay identical to earlier releases.
+    """
+    n = sizes.size
+    all_idx = np.arange(n, dtype=int)
+
+    acc_surface = 0.0
+    selected = []
+    picks = 0
+    counts = np.zeros(n_bins + 1, dtype=np.intp)
+
+    # We will try to sample without replacement while possible
+    available_mask = np.ones(n, dtype=bool)
+    # local copy of probabilities (we will renormalize over available)
+    local_probs = probs.copy()
+
+    while acc_surface < surface_threshold and picks < iter_limit:
+        # available indices
+        available_idx = all_idx[available_mask]
+        if available_idx.size == 0:
+            # no more available events: break
+            break
+
+        # renormalize probabilities over available
+        p_av = local_probs[available_idx]
+        s = p_av.sum()
+        if s <= 0:
+            # fallback to uniform on available
+            p_choice = None
+        else:
+            p_choice = p_av / s
+
+        # choose one index (without replacement)
+        # note: rng.choice with replace=False ensures unique picks in this attempt
+        choice = rng.choice(available_idx, size=1, replace=False, p=p_choice)
+        idx = int(choice[0])
+        selected.append(idx)
+        acc_surface += sizes[idx]
+        picks += 1
+        counts[bin_index[idx]] += 1
+
+        # mark as unavailable to avoid reselecting same perimeter in this attempt
+        available_mask[idx] = False
+
+    return np.array(selected, dtype=int), counts
+
+
+def _draw_tree(
+    rng, sizes, probs, surface_threshold, iter_limit, bin_index, n_bins,
+    tree=None,
+):
+    """
+    Sum-tree engine: same sampling law as _draw_legacy, O(log n) per pick.
+
+    Once every event with positive weight has been drawn, the remaining
+    (zero-weight) events are taken in uniformly random order, matching the
+    uniform fallback of the original loop.
+    """
+    n = sizes.size
+    tree = _SumTree(probs) if tree is None else tree.copy()
+    taken = np.zeros(n, dtype=bool)
+
+    acc_surface = 0.0
+    selected = []
+    picks = 0
+    counts = np.zeros(n_bins + 1, dtype=np.intp)
+
+    uniforms = rng.random(_DRAW_BLOCK)
+    u_pos = 0
+    fallback = None
+    f_pos = 0
+
+    while acc_surface < surface_threshold and picks < iter_limit:
+        if fallback is None and tree.total() > 0.0:
+            if u_pos == uniforms.size:
+                uniforms = rng.random(_DRAW_BLOCK)
+                u_pos = 0
+            idx = tree.draw(uniforms[u_pos])
+            u_pos += 1
+            tree.remove(idx)
+            taken[idx] = True
+        else:
+            if fallback is None:
+                # only zero-weight events are left: uniform order over them
+                fallback = rng.permutation(np.flatnonzero(~taken))
+            if f_pos == fallback.size:
+                # no more available events: break
+                break
+            idx = int(fallback[f_pos])
+            f_pos += 1
+
+        selected.append(idx)
+        acc_surface += sizes[idx]
+        picks += 1
+        counts[bin_index[idx]] += 1
+
+    return np.array(selected, dtype=int), counts
+
+
+def _key_orders(rng, sizes, probs, surface_threshold, iter_limit, n_rows=1):
+    """
+    Pick orders of n_rows attempts and the number of picks each one keeps.
+
+    Efraimidis-Spirakis: ordering the events by decreasing u ** (1 / w), or
+    equivalently by increasing exponential key -log(u) / w, yields a weighted
+    permutation without replacement with exactly the law of drawing one event
+    at a time proportionally to the remaining weights. Zero-weight events are
+    placed after all others in uniformly random order.
+
+    Only a leading prefix of the keys is sorted (argpartition + sort of the
+    prefix). The prefix starts at about twice the expected number of picks
+    and doubles, for the rows that have not reached surface_threshold yet,
+    until they reach it or iter_limit.
+
+    Returns (orders, cuts): orders has shape (n_rows, k) and attempt r keeps
+    orders[r, :cuts[r]] (entries past the prefix a row was sorted to are
+    padding). Rows are filled from the generator in row-major
+    order, so n_rows attempts drawn at once consume the stream exactly like
+    n_rows single attempts and give the same selections.
+    """
+    n = probs.size
+    limit = min(int(iter_limit), n)
+    if limit <= 0 or not surface_threshold > 0:
+        return np.empty((n_rows, 0), dtype=int), np.zeros(n_rows, dtype=int)
+
+    u = rng.random((n_rows, n))
+    zero = probs <= 0
+    with np.errstate(divide="ignore"):
+        keys = -np.log(u) / np.where(zero, 1.0, probs)
+
+    if zero.any():
+        # zero weights go last, ordered among themselves by u
+        zero = np.broadcast_to(zero, u.shape)
+        orders = np.lexsort((np.where(zero, u, keys), zero), axis=-1)
+        orders = orders[:, :limit]
+        return orders, _surface_cutoffs(sizes, orders, surface_threshold)
+    del u
+
+    # the first pick has expected size sum(p * s); later picks are smaller
+    first = float(np.dot(probs, sizes))
+    if first > 0 and np.isfinite(surface_threshold / first):
+        k = min(limit, int(2 * surface_threshold / first) + 16)
+    else:
+        k = limit
+
+    # rows still short of the threshold; only they are sorted again with a
+    # longer prefix
+    rows = np.arange(n_rows)
+    parts = []
+    cuts = np.empty(n_rows, dtype=int)
+    while True:
+        sub = keys if rows.size == n_rows else keys[rows]
+        if k < n:
+            part = np.argpartition(sub, k - 1, axis=1)[:, :k]
+            part_keys = np.take_along_axis(sub, part, axis=1)
+            orders = np.take_along_axis(
+                part, np.argsort(part_keys, axis=1, kind="stable"), axis=1
+            )
+        else:
+            orders = np.argsort(sub, axis=1, kind="stable")
+
+        acc_surface = np.cumsum(sizes[orders], axis=1)
+        reached = acc_surface >= surface_threshold
+        done = reached[:, -1] | (k == limit)
+        hit = reached[done]
+        cuts[rows[done]] = np.where(
+            hit.any(axis=1), np.argmax(hit, axis=1) + 1, k
+        )
+        parts.append((rows[done], orders[done]))
+        rows = rows[~done]
+        if rows.size == 0:
+            break
+        k = min(2 * k, limit)
+
+    if len(parts) == 1:
+        return parts[0][1], cuts
+    # rows finished with shorter prefixes are padded (never read: cuts
+    # stop within each row's own prefix)
+    out = np.zeros((n_rows, k), dtype=parts[0][1].dtype)
+    for done_rows, done_orders in parts:
+        out[done_rows, :done_orders.shape[1]] = done_orders
+    return out, cuts
+
+
+def _surface_cutoffs(sizes, orders, surface_threshold):
+    """
+    Number of picks kept in each row of `orders`: the first position where the
+    accumulated surface reaches the threshold, or the whole row otherwise.
+    """
+    n_rows, limit = orders.shape
+    if limit == 0:
+        return np.zeros(n_rows, dtype=int)
+
+    acc_surface = np.cumsum(sizes[orders], axis=1)
+    reached = acc_surface >= surface_threshold
+    return np.where(
+        reached.any(axis=1), np.argmax(reached, axis=1) + 1, limit
+    )
+
+
+def _draw_keys(
+    rng, sizes, probs, surface_threshold, iter_limit, bin_index, n_bins
+):
+    """
+    Vectorized engine: one keyed partial sort gives the pick order of the whole
+    attempt, and the cumulative surface along that order gives the cutoff.
+
+    The cutoff is the first pick at which the accumulated surface reaches the
+    threshold (or iter_limit / the number of events), i.e. the point where the
+    per-pick loop would stop. np.cumsum accumulates sequentially, so the
+    surface reached is the same value the loop would compute.
+    """
+    orders, cuts = _key_orders(
+        rng, sizes, probs, surface_threshold, iter_limit
+    )
+    selected = orders[0, :cuts[0]]
+    counts = np.bincount(bin_index[selected], minlength=n_bins + 1)
+    return selected, counts
+
+
+def _batch_rows(n, iter_limit, memory_budget):
+    """Number of attempts whose key matrices fit in memory_budget bytes."""
+    # u, keys and partition indices over n events, plus the sorted prefix
+    # and its cumulative surface over min(iter_limit, n) picks
+    per_row = 24 * n + 24 * min(int(iter_limit), n)
+    return max(1, int(memory_budget // max(per_row, 1)))
+
+
+def _draw_keys_batch(
+    rng, sizes, probs, surface_threshold, iter_limit, n_rows, bin_index,
+    widths, target_hist,
+):
+    """
+    Batched keys engine: n_rows attempts as one (n_rows, n) key matrix.
+
+    Per-bin counts of all attempts come from a single bincount over
+    row-offset bin indices. Returns (orders, cuts, discrepancies), where the
+    selection of attempt r is orders[r, :cuts[r]].
+    """
+    orders, cuts = _key_orders(
+        rng, sizes, probs, surface_threshold, iter_limit, n_rows
+    )
+    # only the kept prefix of each row takes part in the histograms
+    orders = orders[:, :int(cuts.max(initial=0))]
+
+    n_bins = widths.size
+    bidx = bin_index[orders]
+    keep = (np.arange(orders.shape[1]) < cuts[:, None]) & (bidx < n_bins)
+    flat = (bidx + n_bins * np.arange(n_rows)[:, None])[keep]
+    counts = np.bincount(flat, minlength=n_rows * n_bins)
+    counts = counts.reshape(n_rows, n_bins)
+
+    hist = _density(counts, widths)
+    # an attempt without picks scores an all-zero histogram
+    hist[cuts == 0] = 0.0
+    disc = np.sum(np.abs(hist - target_hist), axis=1)
+
+    return orders, cuts, disc
+
+
+def _prefix_discrepancies(pick_bins, widths, target_hist, chunk=65536):
+    """
+    Discrepancy of every prefix of an attempt, given the bin of each pick.
+
+    Per-bin counts grow by one bin per pick, so the counts of all prefixes are
+    a running sum of one-hot rows; they are evaluated chunk by chunk, carrying
+    the counts over, in O(picks * n_bins). Prefixes without any pick inside
+    the bins give nan.
+    """
+    n_bins = widths.size
+    m = pick_bins.size
+    out = np.empty(m, dtype=float)
+    carry = np.zeros(n_bins + 1, dtype=np.intp)
+
+    for start in range(0, m, chunk):
+        b = pick_bins[start:start + chunk]
+        steps = np.zeros((b.size, n_bins + 1), dtype=np.intp)
+        steps[np.arange(b.size), b] = 1
+        counts = np.cumsum(steps, axis=0) + carry
+        carry = counts[-1]
+
+        hist = _density(counts[:, :n_bins], widths)
+        out[start:start + b.size] = np.sum(np.abs(hist - target_hist), axis=1)
+
+    return out
+
+
+def _stratified_plan(sizes, probs, bin_index, target_hist, widths,
+                     surface_threshold):
+    """
+    Per-run setup of the stratified constructor: the events of every bin,
+    the share of picks each bin should receive (target_hist * widths,
+    normalized) and the expected number of picks needed to reach the
+    threshold with those shares.
+    """
+    n_bins = widths.size
+    mass = np.clip(target_hist * widths, 0.0, None)
+    if not mass.sum() > 0:
+        raise ValueError(
+            "strategy='stratified' needs a target_hist with positive mass"
+        )
+    mass = mass / mass.sum()
+
+    by_bin = np.argsort(bin_index, kind="stable")
+    bounds = np.searchsorted(bin_index[by_bin], np.arange(n_bins + 1))
+    members = [by_bin[bounds[b]:bounds[b + 1]] for b in range(n_bins)]
+
+    # weighted mean size of a draw from each bin
+    mean_size = np.zeros(n_bins)
+    for b, idx in enumerate(members):
+        if idx.size:
+            p = probs[idx]
+            mean_size[b] = (
+                np.dot(p, sizes[idx]) / p.sum() if p.sum() > 0
+                else sizes[idx].mean()
+            )
+    per_pick = float(np.dot(mass, mean_size))
+    if per_pick > 0 and np.isfinite(surface_threshold / per_pick):
+        expected = int(surface_threshold / per_pick) + 1
+    else:
+        expected = sizes.size
+
+    return {"members": members, "mass": mass, "expected": expected}
+
+
+def _draw_stratified(
+    rng, sizes, probs, surface_threshold, iter_limit, bin_index, n_bins, plan,
+):
+    """
+    Stratified constructor: per-bin quotas instead of free weighted draws.
+
+    Inside each bin, events are ordered by exponential keys (weighted
+    sampling without replacement, as in the keys engine). The bins are then
+    interleaved by apportionment: the j-th event of bin b is placed at
+    virtual time (j + 0.5) / mass[b], so after any number of picks every bin
+    holds its target share up to rounding. The attempt stops, as the other
+    engines do, at the first pick where the accumulated surface reaches the
+    threshold (or iter_limit). Bins the target gives no mass, and events
+    outside the bins, are never picked. One attempt is O(n).
+    """
+    n = sizes.size
+    limit = min(int(iter_limit), n)
+    counts = np.zeros(n_bins + 1, dtype=np.intp)
+    if limit <= 0 or not surface_threshold > 0:
+        return np.array([], dtype=int), counts
+
+    members = plan["members"]
+    mass = plan["mass"]
+
+    u = rng.random(n)
+    zero = probs <= 0
+    with np.errstate(divide="ignore"):
+        keys = -np.log(u) / np.where(zero, 1.0, probs)
+    # zero weights go last within their bin, ordered among themselves by u
+    keys[zero] = np.inf
+    rank = np.where(zero, u, 0.0)
+
+    k = min(limit, 2 * plan["expected"] + 16)
+    while True:
+        events = []
+        times = []
+        horizon = np.inf
+        for b in range(n_bins):
+            idx = members[b]
+            if mass[b] <= 0 or idx.size == 0:
+                continue
+            if k >= n:
+                take = idx.size
+            else:
+                take = min(idx.size, int(np.ceil(mass[b] * k)) + 1)
+            if take < idx.size:
+                part = idx[np.argpartition(keys[idx], take - 1)[:take]]
+                # the next event of this bin would come at this time
+                horizon = min(horizon, (take + 0.5) / mass[b])
+            else:
+                part = idx
+            part = part[np.lexsort((rank[part], keys[part]))]
+            events.append(part)
+            times.append((np.arange(take) + 0.5) / mass[b])
+
+        if not events:
+            return np.array([], dtype=int), counts
+
+        events = np.concatenate(events)
+        times = np.concatenate(times)
+        merged = np.argsort(times, kind="stable")
+        order = events[merged]
+        # only the picks before the horizon are certain to be in order
+        valid = min(limit, int(np.searchsorted(times[merged], horizon)))
+
+        acc_surface = np.cumsum(sizes[order[:valid]])
+        reached = acc_surface >= surface_threshold
+        if reached.any():
+            cut = int(np.argmax(reached)) + 1
+            break
+        if valid == limit or not np.isfinite(horizon) or k >= n:
+            cut = valid
+            break
+        k = min(2 * k, n)
+
+    selected = order[:cut]
+    counts += np.bincount(bin_index[selected], minlength=n_bins + 1)
+    return selected, counts
+
+
+def _multiset_plan(sizes, probs, bin_index):
+    """
+    Groups of interchangeable events: same size and same weight, hence same
+    bin. Quantized rasters have few distinct (size, weight) pairs, so the
+    multiset engine works on the groups instead of the cells.
+    """
+    # factorize each column (1D sorts), then the pair codes
+    _, size_code = np.unique(sizes, return_inverse=True)
+    prob_values, prob_code = np.unique(probs, return_inverse=True)
+    codes = size_code.astype(np.int64) * prob_values.size + prob_code
+    # members of group g are members[bounds[g]:bounds[g + 1]]
+    members = np.argsort(codes, kind="stable")
+    sorted_codes = codes[members]
+    starts = np.flatnonzero(np.diff(sorted_codes)) + 1
+    bounds = np.concatenate([[0], starts, [codes.size]])
+    counts = np.diff(bounds)
+
+    return {
+        "size": sizes[members[bounds[:-1]]],
+        "weight": probs[members[bounds[:-1]]],
+        "count": counts.astype(np.int64),
+        "bin": bin_index[members[bounds[:-1]]],
+        "members": members,
+        "bounds": bounds,
+    }
+
+
+def _draw_multiset(
+    rng, sizes, probs, surface_threshold, iter_limit, bin_index, n_bins, plan
+):
+    """
+    Multiset engine: one attempt as per-group pick counts.
+
+    Uses the exponential-race view of weighted sampling without replacement
+    (the keys engine): every event arrives at an independent Exp(w) time and
+    events are picked in arrival order. Over a time step dt the number of
+    arrivals of a group with r events left is Binomial(r, 1 - exp(-w dt)),
+    independently across groups, and by memorylessness the race simply
+    restarts after each step. Steps are sized from the remaining surface
+    deficit; in the step that crosses the threshold (or iter_limit), the
+    arrivals are given their truncated-exponential times and sorted to find
+    the exact cutoff. Zero-weight groups are raced uniformly once all others
+    are exhausted. The law of the counts is that of the per-cell engines;
+    the cost is O(n_groups) per step instead of O(n) per attempt.
+
+    Returns (taken, counts): picks per group and per-bin counts.
+    """
+    g_size = plan["size"]
+    g_bin = plan["bin"]
+    remaining = plan["count"].copy()
+    taken = np.zeros_like(remaining)
+
+    limit = min(int(iter_limit), int(remaining.sum()))
+    acc_surface = 0.0
+    picks = 0
+
+    # phase 1 races the positive weights, phase 2 the zero weights uniformly
+    w = plan["weight"]
+    phase = 1
+
+    while acc_surface < surface_threshold and picks < limit:
+        active = (remaining > 0) & (w > 0)
+        if not active.any():
+            if phase == 1:
+                phase = 2
+                w = np.where(plan["weight"] > 0, 0.0, 1.0)
+                continue
+            break
+
+        r = np.where(active, remaining, 0)
+        rate_n = float(np.dot(r, w))
+        rate_s = float(np.dot(r * w, g_size))
+        deficit = surface_threshold - acc_surface
+        # enough time to cover the deficit at the current rate, and at
+        # least one expected arrival
+        dt = 1.0 / rate_n
+        if rate_s > 0:
+            dt = max(dt, deficit / rate_s)
+
+        p = -np.expm1(-w * dt)
+        k = rng.binomial(r, np.where(active, p, 0.0))
+        step_picks = int(k.sum())
+        step_surface = float(np.dot(k, g_size))
+
+        if acc_surface + step_surface < surface_threshold \
+                and picks + step_picks <= limit:
+            taken += k
+            remaining -= k
+            acc_surface += step_surface
+            picks += step_picks
+            continue
+
+        # crossing step: order its arrivals and cut at the stopping pick
+        grp = np.repeat(np.arange(k.size), k)
+        t = -np.log1p(-rng.random(grp.size) * p[grp]) / w[grp]
+        grp = grp[np.argsort(t, kind="stable")]
+        acc = acc_surface + np.cumsum(g_size[grp])
+        reached = acc >= surface_threshold
+        cut = int(np.argmax(reached)) + 1 if reached.any() else grp.size
+        cut = min(cut, limit - picks)
+
+        step = np.bincount(grp[:cut], minlength=k.size)
+        taken += step
+        remaining -= step
+        acc_surface = float(acc[cut - 1]) if cut else acc_surface
+        picks += cut
+        break
+
+    counts = np.bincount(g_bin, weights=taken, minlength=n_bins + 1)
+    return taken, counts.astype(np.intp)
+
+
+def _expand_multiset(rng, plan, taken):
+    """Concrete events for per-group pick counts: a uniformly random subset
+    of each group (its events are interchangeable), in ascending order."""
+    members = plan["members"]
+    bounds = plan["bounds"]
+    picked = [
+        rng.choice(members[bounds[g]:bounds[g + 1]], int(taken[g]),
+                   replace=False)
+        for g in np.flatnonzero(taken)
+    ]
+    if not picked:
+        return np.array([], dtype=np.intp)
+    return np.sort(np.concatenate(picked))
@@ -1,6 +1,121 @@
 # src/scenfirepy/selection.py
+import time
+
 import numpy as np
 
+from .cache import _cache_get, _cache_key, _cache_put
+from .checkpoint import _load_checkpoint, _save_checkpoint
+from .distribution import _bin_index, _density
+from .refine import refine_selection
+from .sampling import (
+    _SumTree,
+    _batch_rows,
+    _draw_keys,
+    _draw_keys_batch,
+    _draw_legacy,
+    _draw_multiset,
+    _draw_tree,
+    _draw_stratified,
+    _expand_multiset,
+    _multiset_plan,
+    _prefix_discrepancies,
+    _stratified_plan,
+)
+
+_METHODS = ("tree", "keys", "batch", "multiset", "legacy")
+_STRATEGIES = ("random", "stratified")
+# attempts needed before the estimated minimum may stop a run, and for
+# how many attempts the estimate must have held still
+_MIN_ESTIMATE_ATTEMPTS = 100
+_STABLE_ESTIMATE_ATTEMPTS = 100
+# lowest attempt discrepancies the minimum is estimated from
+_ESTIMATE_ORDER = 30
+# Weibull shapes tried for the lower tail of the discrepancies. The
+# discrepancy is a distance over several bins, whose lower tail is thin;
+# shapes below 3 extrapolate too little and stop runs early.
+_ESTIMATE_SHAPES = np.geomspace(3.0, 10.0, 20)
+
+
+def _best_prefix(selected, bin_index, widths, target_hist):
+    """Shortest prefix of an attempt with the lowest discrepancy."""
+    if selected.size == 0:
+        return selected, float(np.sum(np.abs(target_hist)))
+
+    discs = _prefix_discrepancies(bin_index[selected], widths, target_hist)
+    discs = np.where(np.isnan(discs), np.inf, discs)
+    k = int(np.argmin(discs))
+    return selected[:k + 1], float(discs[k])
+
+
+class _Trajectory:
+    """
+    Running statistics of the attempt discrepancies: the lowest ones and
+    the minimum estimated from them, the number of attempts since that
+    estimate last moved by more than tol, and the number of attempts since
+    the best last improved by more than tol.
+    """
+
+    def __init__(self, tol):
+        self.tol = tol
+        self.n = 0
+        self.lows = np.array([])
+        self.plateau = np.inf
+        self.since = 0
+        self.anchor = np.nan
+        self.steady = 0
+
+    def state(self):
+        return [self.n, self.plateau, self.since, self.anchor, self.steady,
+                *self.lows.tolist()]
+
+    def restore(self, state):
+        n, self.plateau, since, self.anchor, steady, *lows = state
+        self.n = int(n)
+        self.since = int(since)
+        self.steady = int(steady)
+        self.lows = np.array(lows, dtype=float)
+
+    def update(self, discs):
+        for d in discs:
+            self.steady += 1
+            if not d < np.inf:  # nan or inf: no information
+                self.since += 1
+                continue
+            self.n += 1
+            if self.lows.size < _ESTIMATE_ORDER or d < self.lows[-1]:
+                at = np.searchsorted(self.lows, d)
+                self.lows = np.insert(self.lows, at, d)[:_ESTIMATE_ORDER]
+                estimate = self.estimate()
+                if not abs(estimate - self.anchor) <= self.tol:
+                    self.anchor = estimate
+                    self.steady = 0
+            if d < self.plateau - self.tol:
+                self.plateau = d
+                self.since = 0
+            else:
+                self.since += 1
+
+    def estimate(self):
+        """
+        Lower end point of the discrepancy distribution, from a Weibull
+        fit of its lower tail: the k lowest discrepancies are fitted by
+        least squares as d(j) = m + b * j ** (1 / a) over the shapes a of
+        _ESTIMATE_SHAPES, and m of the best fit (between 0 and d(1)) is
+        the best discrepancy further attempts can be expected to reach.
+        """
+        low = self.lows
+        if low.size < 3:
+            return np.nan
+        x = np.arange(1, low.size + 1) ** (1 / _ESTIMATE_SHAPES[:, None])
+        xc = x - x.mean(axis=1, keepdims=True)
+        yc = low - low.mean()
+        slope = np.maximum((xc @ yc) / np.einsum("ij,ij->i", xc, xc), 0.0)
+        resid = yc - slope[:, None] * xc
+        best = np.argmin(np.einsum("ij,ij->i", resid, resid))
+        end = low.mean() - slope[best] * x[best].mean()
+        return float(np.clip(end, 0.0, low[0]))
+
+
 def select_events(
     event_sizes,
     event_probabilities,
@@ -12,6 +127,21 @@ def select_events(
     iter_limit,
     max_it,
     seed=None,
+    method="tree",
+    memory_budget=2**22,
+    best_prefix=False,
+    refine=None,
+    strategy="random",
+    callback=None,
+    time_budget=None,
+    deadline=None,
+    patience=None,
+    convergence_tol=None,
+    checkpoint=None,
+    checkpoint_every=100,
+    resume_from=None,
+    cache=None,
+    cache_size=2**30,
 ):
     """
     Mirror of scenfire::select_events (keyword-based call style).
@@ -26,8 +156,122 @@ def select_events(
     surface_threshold : float (stop selection when accumulated surface >= this)
     tolerance : float (early stop when discrepancy <= tolerance)
     iter_limit : int (max number of picks per attempt to reach threshold)
-    max_it : int (number of independent attempts / outer loops)
+    max_it : int | None (number of independent attempts / outer loops;
+        None = no limit, then time_budget or deadline is required)
     seed : int | None (rng seed)
+    method : str (sampling engine, default "tree")
+        "tree"   : sum-tree over the weights; each pick and removal is
+                   O(log n) instead of O(n).
+        "keys"   : whole attempt in one vectorized step. Events are ordered
+                   by exponential keys -log(u) / p (Efraimidis-Spirakis), the
+                   leading iter_limit keys are partially sorted, and the pick
+                   where cumsum(sizes) first reaches surface_threshold is the
+                   cutoff. No Python-level loop per pick.
+        "batch"  : keys mode for many attempts at once. B attempts are drawn
+                   as one (B, n) key matrix; their cutoffs and per-bin counts
+                   (one bincount over precomputed bin indices) are computed
+                   together and the best attempt of the batch is kept. The
+                   tolerance early exit is checked after each batch. The
+                   random stream is consumed as in the keys mode.
+        "multiset" : for quantized rasters with many events of equal size.
+                   Events with the same (size, weight) are interchangeable,
+                   so they are grouped once and an attempt only draws how
+                   many events of each group are picked (binomial steps of
+                   the keys-mode exponential race, O(n_groups) per step).
+                   The best attempt's counts are expanded to concrete events
+                   by a uniform choice within each group. Not combinable
+                   with best_prefix (the pick order is not materialized).
+        "legacy" : original loop renormalizing over the available events and
+                   calling rng.choice per pick. Opt in to reproduce results
+                   obtained with earlier releases for the same seed.
+        All engines follow the same sampling law (weighted draws without
+        replacement, uniform over the remaining events once all positive
+        weights are exhausted), so the distribution of the selections, and of
+        their discrepancies, is the same whichever is used. For the keys
+        mode this is the Efraimidis-Spirakis equivalence: P(event i is next)
+        equals p_i / sum of the remaining p, exactly as in the loop. They
+        consume the random stream differently, so a given seed yields
+        different selections.
+    memory_budget : int (bytes of working memory for one batch, default
+        4 MiB, about what stays in cache; sets B in the batch mode, at
+        least one attempt per batch)
+    best_prefix : bool (default False)
+        If True, every prefix of an attempt's pick sequence is scored and the
+        attempt contributes its best prefix instead of its final state. The
+        retained selection may then stop short of surface_threshold.
+    refine : None | bool | int | dict (default None)
+        Local-search refinement of the best selection after the attempts
+        (see refine_selection), continuing the same random stream. True uses
+        the refine_selection defaults, an int sets n_moves, a dict is passed
+        as keyword arguments.
+    strategy : str (how an attempt is built, default "random")
+        "random"     : weighted sampling without replacement with the engine
+                       given by method.
+        "stratified" : per-bin quotas. The share of picks of each bin follows
+                       target_hist * bin widths; events are drawn by weight
+                       inside each bin and the bins are interleaved so every
+                       prefix keeps the target shares, until surface_threshold
+                       is reached. Each attempt is O(n) and already close to
+                       the target, so few attempts are needed. method is
+                       ignored; bins with no target mass and events outside
+                       the bins are never selected.
+    callback : callable | None (default None)
+        Observer called after every attempt with a dict of stats:
+          - "attempt": int (1-based attempt number)
+          - "picks": int (events in the attempt's selection)
+          - "surface": float (accumulated surface of the attempt)
+          - "discrepancy": float (of the attempt)
+          - "best_discrepancy": float (best so far)
+          - "elapsed": float (seconds since the start of the run)
+          - "sampling_time", "histogram_time": float (cumulative seconds
+            spent drawing attempts and scoring their histograms; in the
+            batch mode the histograms are computed with the draws and
+            counted as sampling)
+        In the batch mode the calls for a batch are made once it is drawn.
+        Returning True stops the run with the best selection so far.
+        Without a callback nothing is timed or recorded.
+    time_budget : float | None (default None)
+        Anytime mode: seconds of wall-clock time for the attempts. The run
+        stops after the first attempt (batch in the batch mode) that ends
+        past the budget and returns the best selection so far.
+    deadline : float | None (default None)
+        Same with an absolute time.time() timestamp. With both, the
+        earlier one applies. At least one attempt is always made.
+    patience : int | None (default None)
+        Adaptive stopping: stop once the best discrepancy has not improved
+        by more than convergence_tol (0 if None) for patience attempts.
+    convergence_tol : float | None (default None)
+        Adaptive stopping: stop once the best discrepancy is within
+        convergence_tol of the estimated minimum (see
+        "estimated_min_discrepancy"), i.e. when further attempts can gain
+        at most about convergence_tol. Checked after at least 100 attempts,
+        and only once the estimate has not moved by more than
+        convergence_tol for 100 attempts.
+        Both rules are checked after every attempt (batch in the batch
+        mode) and stop with stop_reason "converged".
+    checkpoint : str | None (default None)
+        Path of a checkpoint file (.npz) written every checkpoint_every
+        attempts (at the end of a batch in the batch mode) and when the
+        attempts end. It holds the best selection, the attempt count, the
+        discrepancy statistics and the random generator state.
+    checkpoint_every : int (attempts between checkpoints, default 100)
+    resume_from : str | None (default None)
+        Checkpoint to continue from. With the same inputs and options the
+        run continues exactly as if it had not stopped (seed is then
+        ignored: the generator state comes from the checkpoint). max_it
+        counts the attempts of the whole run, those before the checkpoint
+        included; time limits only count from the resume. A checkpoint
+        written with other input arrays or options (anything but seed,
+        max_it, the time limits, callback and the checkpoint settings)
+        raises ValueError.
+    cache : str | None (default None)
+        Directory of a disk cache of results, keyed by a hash of the input
+        arrays, of the options that determine the result and of the
+        algorithm version. A repeated request returns the stored result
+        without running. Only reproducible runs are cached: an integer
+        seed and no callback, time limit, checkpoint or resume.
+    cache_size : int (bytes the cache directory may hold, default 1 GiB;
+        least recently used entries are evicted beyond it)
 
     Returns
     -------
@@ -36,6 +280,13 @@ def select_events(
       - "events": numpy array of selected event sizes
       - "discrepancy": float (best discrepancy)
       - "total_surface": float (sum sizes of selected events)
+      - "attempts": int (number of attempts made)
+      - "stop_reason": str ("max_it", "tolerance", "time_budget",
+        "deadline", "converged" or "callback")
+      - "estimated_min_discrepancy": float (extreme-value estimate of the
+        lowest discrepancy attempts can reach, from a Weibull fit of the
+        30 best attempt discrepancies, between 0 and the best; nan with
+        fewer than three scored attempts)
     """
     rng = np.random.default_rng(seed)
 
@@ -50,6 +301,10 @@ def select_events(
 
     # sanitize probabilities
     probs = np.nan_to_num(probs, nan=0.0)
+    # checked here for every engine (only rng.choice in the legacy loop
+    # would catch it)
+    if (probs < 0).any():
+        raise ValueError("event_probabilities must be non-negative")
     if probs.sum() <= 0:
         probs = np.ones_like(probs, dtype=float)
     probs = probs.astype(float)
@@ -59,70 +314,319 @@ def select_events(
     if bins.size != target_hist.size + 1:
         raise ValueError("bins length must be len(target_hist) + 1")
 
+    if method not in _METHODS:
+        raise ValueError(f"method must be one of {_METHODS}")
+
+    if strategy not in _STRATEGIES:
+        raise ValueError(f"strategy must be one of {_STRATEGIES}")
+
+    if method == "multiset" and best_prefix and strategy == "random":
+        raise ValueError("best_prefix is not supported with method='multiset'")
+
+    if max_it is None and time_budget is None and deadline is None:
+        raise ValueError("max_it=None requires time_budget or deadline")
+
+    # what determines the course of the attempts, besides the seed and
+    # max_it: keys the result cache and ties checkpoints to their run
+    arrays = {"sizes": sizes, "probs": probs, "target_hist": target_hist,
+              "bins": bins}
+    options = {
+        "surface_threshold": float(surface_threshold),
+        "tolerance": float(tolerance),
+        "iter_limit": int(iter_limit),
+        "method": method,
+        "memory_budget": int(memory_budget),
+        "best_prefix": bool(best_prefix),
+        "refine": refine,
+        "strategy": strategy,
+        "patience": None if patience is None else int(patience),
+        "convergence_tol": (
+            None if convergence_tol is None else float(convergence_tol)
+        ),
+    }
+
+    cache_key = None
+    if cache is not None and isinstance(seed, (int, np.integer)) and all(
+        option is None for option in
+        (callback, time_budget, deadline, checkpoint, resume_from)
+    ):
+        cache_key = _cache_key(arrays, dict(
+            options,
+            max_it=None if max_it is None else int(max_it),
+            seed=int(seed),
+        ))
+        hit = _cache_get(cache, cache_key)
+        if hit is not None:
+            index, scalars = hit
+            return dict(
+                scalars, surface_index=index, events=sizes[index]
+            )
+
+    # time limit on the monotonic clock, and which parameter sets it
+    stop_at = None
+    if time_budget is not None:
+        stop_at = time.monotonic() + float(time_budget)
+        time_reason = "time_budget"
+    if deadline is not None:
+        until = time.monotonic() + (float(deadline) - time.time())
+        if stop_at is None or until < stop_at:
+            stop_at = until
+            time_reason = "deadline"
+
     best_disc = np.inf
     best_idx = None
     best_total = 0.0
 
-    # Precompute indices array for speed
-    all_idx = np.arange(n, dtype=int)
-
-    for attempt in range(int(max_it)):
-        acc_surface = 0.0
-        selected = []
-        picks = 0
-
-        # We will try to sample without replacement while possible
-        available_mask = np.ones(n, dtype=bool)
-        # local copy of probabilities (we will renormalize over available)
-        local_probs = probs.copy()
-
-        while acc_surface < surface_threshold and picks < iter_limit:
-            # available indices
-            available_idx = all_idx[available_mask]
-            if available_idx.size == 0:
-                # no more available events: break
-                break
-
-            # renormalize probabilities over available
-            p_av = local_probs[available_idx]
-            s = p_av.sum()
-            if s <= 0:
-                # fallback to uniform on available
-                p_choice = None
+    # bin membership of every event is fixed for the whole run
+    bin_index = _bin_index(sizes, bins)
+    widths = np.diff(bins)
+    n_bins = widths.size
+
+    if strategy == "stratified":
+        plan = _stratified_plan(
+            sizes, probs, bin_index, target_hist, widths, surface_threshold
+        )
+        method = "stratified"
+    elif method == "tree":
+        # build once; every attempt works on a copy
+        tree = _SumTree(probs)
+    elif method == "batch":
+        batch_rows = _batch_rows(n, iter_limit, memory_budget)
+    elif method == "multiset":
+        plan = _multiset_plan(sizes, probs, bin_index)
+        best_taken = None
+
+    observe = callback is not None
+    if observe:
+        clock = time.perf_counter
+        t_start = clock()
+        sampling_time = 0.0
+        histogram_time = 0.0
+
+    if patience is not None and int(patience) <= 0:
+        raise ValueError("patience must be positive")
+    trajectory = _Trajectory(
+        0.0 if convergence_tol is None else float(convergence_tol)
+    )
+
+    if checkpoint is not None and int(checkpoint_every) <= 0:
+        raise ValueError("checkpoint_every must be positive")
+
+    max_it = np.inf if max_it is None else int(max_it)
+    attempt = 0
+    stop_reason = "max_it"
+
+    if checkpoint is not None or resume_from is not None:
+        inputs_key = _cache_key(arrays, options)
+
+    if resume_from is not None:
+        state = _load_checkpoint(resume_from)
+        if state["inputs"] != inputs_key:
+            raise ValueError(
+                "checkpoint was written for other inputs or options"
+            )
+        rng.bit_generator.state = state["rng_state"]
+        attempt = state["attempt"]
+        best_disc = state["best_disc"]
+        best_total = state["best_total"]
+        if method == "multiset":
+            best_taken = state["best"]
+        elif state["best"] is not None:
+            best_idx = state["best"].astype(int)
+        trajectory.restore(state["trajectory"])
+
+    def save_checkpoint():
+        _save_checkpoint(checkpoint, {
+            "rng_state": rng.bit_generator.state,
+            "inputs": inputs_key,
+            "attempt": attempt,
+            "best_disc": best_disc,
+            "best_total": best_total,
+            "best": best_taken if method == "multiset" else best_idx,
+            "trajectory": trajectory.state(),
+        })
+
+    def converged():
+        """Stop reason given by the best and the trajectory, or None."""
+        if best_disc <= tolerance:
+            return "tolerance"
+        if patience is not None and trajectory.since >= int(patience):
+            return "converged"
+        if (
+            convergence_tol is not None
+            and trajectory.n >= _MIN_ESTIMATE_ATTEMPTS
+            and trajectory.steady >= _STABLE_ESTIMATE_ATTEMPTS
+            and best_disc - trajectory.estimate() <= convergence_tol
+        ):
+            return "converged"
+        return None
+
+    if resume_from is not None and converged() is not None:
+        # the run had already ended there
+        stop_reason = converged()
+        max_it = attempt
+
+    saved_at = attempt
+    while attempt < max_it:
+        if observe:
+            t0 = clock()
+
+        if method == "batch":
+            n_rows = int(min(batch_rows, max_it - attempt))
+            orders, cuts, discs = _draw_keys_batch(
+                rng, sizes, probs, surface_threshold, iter_limit, n_rows,
+                bin_index, widths, target_hist,
+            )
+            attempt += n_rows
+            if observe:
+                t1 = clock()
+
+            if best_prefix:
+                rows = [
+                    _best_prefix(orders[r, :cuts[r]], bin_index, widths,
+                                 target_hist)
+                    for r in range(n_rows)
+                ]
+                discs = np.array([d for _, d in rows])
+
+            # best attempt of the batch (nan discrepancies never win)
+            j = int(np.argmin(np.where(np.isnan(discs), np.inf, discs)))
+            if best_prefix:
+                selected, disc = rows[j]
             else:
-                p_choice = p_av / s
-
-            # choose one index (without replacement)
-            # note: rng.choice with replace=False ensures unique picks in this attempt
-            choice = rng.choice(available_idx, size=1, replace=False, p=p_choice)
-            idx = int(choice[0])
-            selected.append(idx)
-            acc_surface += sizes[idx]
-            picks += 1
-
-            # mark as unavailable to avoid reselecting same perimeter in this attempt
-            available_mask[idx] = False
-
-        # compute histogram (density) with same bins
-        if len(selected) == 0:
-            hist = np.zeros_like(target_hist)
+                selected = orders[j, :cuts[j]]
+                disc = float(discs[j])
         else:
-            sel_sizes = sizes[np.array(selected, dtype=int)]
-            hist, _ = np.histogram(sel_sizes, bins=bins, density=True)
+            if method == "tree":
+                selected, counts = _draw_tree(
+                    rng, sizes, probs, surface_threshold, iter_limit,
+                    bin_index, n_bins, tree=tree,
+                )
+            elif method == "stratified":
+                selected, counts = _draw_stratified(
+                    rng, sizes, probs, surface_threshold, iter_limit,
+                    bin_index, n_bins, plan,
+                )
+            elif method == "multiset":
+                # selected holds the picks per group, not event indices
+                selected, counts = _draw_multiset(
+                    rng, sizes, probs, surface_threshold, iter_limit,
+                    bin_index, n_bins, plan,
+                )
+            elif method == "keys":
+                selected, counts = _draw_keys(
+                    rng, sizes, probs, surface_threshold, iter_limit,
+                    bin_index, n_bins,
+                )
+            else:
+                selected, counts = _draw_legacy(
+                    rng, sizes, probs, surface_threshold, iter_limit,
+                    bin_index, n_bins,
+                )
+            attempt += 1
+            if observe:
+                t1 = clock()
+
+            if best_prefix:
+                selected, disc = _best_prefix(
+                    selected, bin_index, widths, target_hist
+                )
+            else:
+                # density histogram from the per-bin counts of the attempt
+                if counts.sum() == 0:
+                    hist = np.zeros_like(target_hist)
+                else:
+                    hist = _density(counts[:n_bins], widths)
+
+                # discrepancy (L1)
+                disc = float(np.sum(np.abs(hist - target_hist)))
+
+        stop = False
+        if observe:
+            t2 = clock()
+            sampling_time += t1 - t0
+            histogram_time += t2 - t1
+            if method == "batch":
+                scored = [
+                    (rows[r][0] if best_prefix else orders[r, :cuts[r]],
+                     float(discs[r]))
+                    for r in range(n_rows)
+                ]
+            else:
+                scored = [(selected, disc)]
 
-        # discrepancy (L1)
-        disc = float(np.sum(np.abs(hist - target_hist)))
+            running = best_disc
+            first = attempt - len(scored)
+            for k, (sel_k, disc_k) in enumerate(scored):
+                if method == "multiset":
+                    picks = int(sel_k.sum())
+                    surface = float(np.dot(sel_k, plan["size"]))
+                else:
+                    picks = len(sel_k)
+                    surface = float(np.sum(sizes[sel_k]))
+                if disc_k < running:
+                    running = disc_k
+                stop = bool(callback({
+                    "attempt": first + k + 1,
+                    "picks": picks,
+                    "surface": surface,
+                    "discrepancy": disc_k,
+                    "best_discrepancy": float(running),
+                    "elapsed": t2 - t_start,
+                    "sampling_time": sampling_time,
+                    "histogram_time": histogram_time,
+                })) or stop
+
+        trajectory.update(discs.tolist() if method == "batch" else [disc])
 
         # update best
         if disc < best_disc:
             best_disc = disc
-            best_idx = np.array(selected, dtype=int)
-            best_total = float(np.sum(sizes[best_idx]))
+            if method == "multiset":
+                best_taken = selected
+            else:
+                best_idx = np.array(selected, dtype=int)
+                best_total = float(np.sum(sizes[best_idx]))
 
-        # early exit
-        if best_disc <= tolerance:
+        # early exit (per batch in the batch mode)
+        reason = converged()
+        if reason is None and stop:
+            reason = "callback"
+        if reason is None and stop_at is not None \
+                and time.monotonic() >= stop_at:
+            reason = time_reason
+        if reason is not None:
+            stop_reason = reason
             break
 
+        if checkpoint is not None and attempt - saved_at >= checkpoint_every:
+            save_checkpoint()
+            saved_at = attempt
+
+    if checkpoint is not None:
+        save_checkpoint()
+
+    if method == "multiset" and best_taken is not None:
+        best_idx = _expand_multiset(rng, plan, best_taken)
+        best_total = float(np.sum(sizes[best_idx]))
+
+    refining = refine is not None and refine is not False
+    if refining and best_idx is not None and best_idx.size > 0:
+        if isinstance(refine, dict):
+            refine_options = dict(refine)
+        elif refine is True:
+            refine_options = {}
+        else:
+            refine_options = {"n_moves": int(refine)}
+        refined = refine_selection(
+            best_idx, sizes, probs, target_hist, bins, surface_threshold,
+            seed=rng, **refine_options,
+        )
+        if refined["discrepancy"] < best_disc:
+            best_disc = refined["discrepancy"]
+            best_idx = refined["surface_index"]
+            best_total = refined["total_surface"]
+
     # final packaging
     if best_idx is None:
         best_idx = np.array([], dtype=int)
@@ -130,9 +634,21 @@ def select_events(
     else:
         best_events = sizes[best_idx]
 
-    return {
+    result = {
         "surface_index": best_idx,
         "events": best_events,
         "discrepancy": float(best_disc),
         "total_surface": float(best_total),
+        "attempts": int(attempt),
+        "stop_reason": stop_reason,
+        "estimated_min_discrepancy": float(trajectory.estimate()),
     }
+
+    if cache_key is not None:
+        scalars = {
+            k: v for k, v in result.items()
+            if k not in ("surface_index", "events")
+        }
+        _cache_put(cache, cache_key, best_idx, scalars, int(cache_size))
+
+    return result
@@ -0,0 +1,108 @@
+# src/scenfirepy/streaming.py
+"""
+Chunked access to large value collections (sizes of simulated or observed
+fires) for the out-of-core reducers.
+
+A source is any of:
+  - a numpy array or memmap (read in slices of chunk_size values);
+  - a path to a .npy file (opened with mmap_mode="r");
+  - a list or tuple of the above, e.g. one array or file per simulation;
+  - a callable returning an iterable of array chunks (re-iterable: it is
+    called once per pass);
+  - an iterable of array chunks (one pass only).
+Sources are split into parts that can be reduced independently (one slice,
+file or iterable each), so reducers can run over the parts in a thread pool
+and merge the results; numpy releases the GIL in the heavy loops.
+"""
+import numbers
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+_CHUNK = 2**20
+
+
+def _is_one_shot(source):
+    """True for sources that can be iterated only once."""
+    if isinstance(source, (list, tuple)):
+        return any(_is_one_shot(s) for s in source)
+    return isinstance(source, Iterator)
+
+
+def _parts(source, chunk_size=_CHUNK):
+    """Independent parts of a source, in order."""
+    if isinstance(source, (str, os.PathLike)) or callable(source):
+        return [source]
+    if isinstance(source, (list, tuple)):
+        if all(isinstance(s, numbers.Number) for s in source):
+            return _parts(np.asarray(source, dtype=float), chunk_size)
+        return [p for s in source for p in _parts(s, chunk_size)]
+    if isinstance(source, np.ndarray):
+        flat = source.reshape(-1)
+        return [
+            flat[start:start + chunk_size]
+            for start in range(0, flat.size, chunk_size)
+        ] or [flat]
+    return [source]
+
+
+def _chunks(part, chunk_size=_CHUNK):
+    """float64 1D chunks of one part."""
+    if isinstance(part, (str, os.PathLike)):
+        part = np.load(part, mmap_mode="r")
+    if isinstance(part, np.ndarray):
+        flat = part.reshape(-1)
+        for start in range(0, flat.size, chunk_size):
+            yield np.asarray(flat[start:start + chunk_size], dtype=float)
+        return
+    if callable(part):
+        part = part()
+    for chunk in part:
+        yield np.asarray(chunk, dtype=float).reshape(-1)
+
+
+def _map_parts(func, parts, n_jobs=1):
+    """[func(part) for part in parts], over n_jobs threads (None = all
+    cores)."""
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(int(n_jobs), len(parts)))
+    if n_jobs == 1:
+        return [func(part) for part in parts]
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(func, parts))
+
+
+def _range_of(chunks):
+    """(smallest positive value, largest value) over chunks."""
+    vmin = np.inf
+    vmax = -np.inf
+    for chunk in chunks:
+        if chunk.size:
+            vmin = min(vmin, np.min(chunk, where=chunk > 0, initial=np.inf))
+            vmax = max(vmax, np.max(chunk))
+    return vmin, vmax
+
+
+def _summary(chunks):
+    """{"count", "sum", "max"} of the values of chunks."""
+    count = 0
+    total = 0.0
+    vmax = -np.inf
+    for chunk in chunks:
+        if chunk.size:
+            count += chunk.size
+            total += float(np.sum(chunk))
+            vmax = max(vmax, float(np.max(chunk)))
+    return {"count": count, "sum": total, "max": vmax}
+
+
+def _merge_summaries(summaries):
+    """Combine the _summary of several parts."""
+    return {
+        "count": sum(s["count"] for s in summaries),
+        "sum": float(sum(s["sum"] for s in summaries)),
+        "max": max((s["max"] for s in summaries), default=-np.inf),
+    }
@@ -0,0 +1,230 @@
+# src/scenfirepy/sweep.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .distribution import _bin_index, _density, build_target_hist
+from .sampling import _key_orders
+
+# per-process inputs, set once by _init_worker instead of pickled per task
+_WORKER = {}
+
+
+def _init_worker(data):
+    _WORKER["data"] = data
+
+
+def _sweep_seed(seed):
+    """
+    All grid points of one seed. Each attempt draws one key ordering (keys
+    mode of select_events) long enough for the largest threshold; every
+    threshold keeps the prefix up to its own cutoff and every bin grid
+    scores it from its precomputed bin indices.
+    """
+    data = _WORKER["data"]
+    sizes = data["sizes"]
+    probs = data["probs"]
+    thresholds = data["thresholds"]  # ascending
+    grids = data["grids"]
+    tolerance = data["tolerance"]
+
+    n_t = thresholds.size
+    n_g = len(grids)
+    best = np.full((n_g, n_t), np.inf)
+    best_sel = [[None] * n_t for _ in range(n_g)]
+    attempts = np.zeros((n_g, n_t), dtype=int)
+    active = np.ones((n_g, n_t), dtype=bool)
+
+    rng = np.random.default_rng(seed)
+    for _ in range(data["max_it"]):
+        if not active.any():
+            break
+
+        orders, _ = _key_orders(
+            rng, sizes, probs, thresholds[-1], data["iter_limit"]
+        )
+        order = orders[0]
+        acc = np.cumsum(sizes[order])
+        # first pick reaching each threshold, as the keys mode cuts
+        cuts = np.minimum(
+            np.searchsorted(acc, thresholds, side="left") + 1, order.size
+        )
+
+        for g, grid in enumerate(grids):
+            n_bins = grid["widths"].size
+            pick_bins = grid["bin_index"][order[:cuts[-1]]]
+            counts = np.zeros(n_bins + 1, dtype=np.intp)
+            prev = 0
+            for j in range(n_t):
+                # thresholds ascend, so counts grow prefix by prefix
+                counts += np.bincount(
+                    pick_bins[prev:cuts[j]], minlength=n_bins + 1
+                )
+                prev = cuts[j]
+                if not active[g, j]:
+                    continue
+
+                if counts.sum() == 0:
+                    hist = np.zeros_like(grid["target_hist"])
+                else:
+                    hist = _density(counts[:n_bins], grid["widths"])
+                disc = float(np.sum(np.abs(hist - grid["target_hist"])))
+
+                attempts[g, j] += 1
+                if disc < best[g, j]:
+                    best[g, j] = disc
+                    best_sel[g][j] = order[:cuts[j]].copy()
+                if best[g, j] <= tolerance:
+                    active[g, j] = False
+
+    rows = []
+    for g, grid in enumerate(grids):
+        for j in range(n_t):
+            sel = best_sel[g][j]
+            if sel is None:
+                sel = np.array([], dtype=int)
+            rows.append({
+                "seed": seed,
+                "num_bins": grid["num_bins"],
+                "surface_threshold": float(thresholds[j]),
+                "discrepancy": float(best[g, j]),
+                "n_events": int(sel.size),
+                "total_surface": float(np.sum(sizes[sel])),
+                "attempts": int(attempts[g, j]),
+                "surface_index": sel,
+            })
+    return rows
+
+
+def sweep(
+    event_sizes,
+    event_probabilities,
+    event_surfaces,
+    surface_thresholds,
+    num_bins,
+    seeds,
+    tolerance=0.0,
+    iter_limit=None,
+    max_it=100,
+    target_sizes=None,
+    n_jobs=1,
+):
+    """
+    Run select_events over a grid of surface thresholds, bin counts and
+    seeds, sharing the work common to grid points.
+
+    The event set is prepared once: weights are sanitized and normalized as
+    in select_events, and for every num_bins the target histogram
+    (build_target_hist(target_sizes, event_surfaces, num_bins)) and the bin
+    index of every event are computed once. A grid point is the keys mode
+    of select_events (method="keys") with that seed, threshold and target:
+    its attempts are weighted orderings of the events cut where the
+    accumulated surface reaches the threshold. The threshold only moves the
+    cutoff, so each attempt of a seed draws a single ordering, long enough
+    for the largest threshold, and all thresholds and bin counts score
+    their prefix of it. Seeds are scheduled over a ProcessPoolExecutor.
+
+    Parameters
+    ----------
+    event_sizes : array-like (simulated event areas)
+    event_probabilities : array-like (per-event sampling weights, >=0)
+    event_surfaces : array-like (as in build_target_hist)
+    surface_thresholds : array-like (absolute thresholds, e.g.
+        np.array([0.2, 0.4]) * reference_surface)
+    num_bins : int | array-like of int (bin counts of the target)
+    seeds : int | array-like of int (one independent run per seed; no
+        duplicates)
+    tolerance : float (a grid point stops once it reaches it)
+    iter_limit : int | None (max picks per attempt; None = no limit)
+    max_it : int (attempts per grid point)
+    target_sizes : array-like | None (sizes the target histograms are built
+        from; default event_sizes)
+    n_jobs : int | None (worker processes; 1 = in this process, None =
+        os.cpu_count())
+
+    Returns
+    -------
+    pandas.DataFrame with one row per (seed, num_bins, surface_threshold)
+    and columns seed, num_bins, surface_threshold, discrepancy, n_events,
+    total_surface, attempts and surface_index (array of the best
+    selection). Each row equals the select_events result for that grid
+    point.
+    """
+    import pandas as pd
+
+    sizes = np.asarray(event_sizes, dtype=float)
+    probs = np.asarray(event_probabilities, dtype=float)
+    if sizes.size == 0:
+        raise ValueError("No event_sizes provided.")
+    if probs.shape != sizes.shape:
+        raise ValueError("event_probabilities must match event_sizes")
+
+    # sanitize probabilities (as in select_events)
+    probs = np.nan_to_num(probs, nan=0.0)
+    if (probs < 0).any():
+        raise ValueError("event_probabilities must be non-negative")
+    if probs.sum() <= 0:
+        probs = np.ones_like(probs, dtype=float)
+    probs = probs / probs.sum()
+
+    thresholds = np.asarray(surface_thresholds, dtype=float).ravel()
+    if thresholds.size == 0 or not np.all(thresholds > 0):
+        raise ValueError("surface_thresholds must be positive")
+    levels = np.unique(thresholds)
+
+    num_bins = [int(b) for b in np.atleast_1d(num_bins)]
+    seeds = [int(s) for s in np.atleast_1d(seeds)]
+    if len(set(seeds)) != len(seeds):
+        raise ValueError("seeds must be distinct")
+    if target_sizes is None:
+        target_sizes = sizes
+
+    grids = []
+    for b in dict.fromkeys(num_bins):
+        target = build_target_hist(target_sizes, event_surfaces, num_bins=b)
+        bins = np.asarray(target["bins"], dtype=float)
+        grids.append({
+            "num_bins": b,
+            "target_hist": np.asarray(target["target_hist"], dtype=float),
+            "widths": np.diff(bins),
+            "bin_index": _bin_index(sizes, bins),
+        })
+
+    data = {
+        "sizes": sizes,
+        "probs": probs,
+        "thresholds": levels,
+        "grids": grids,
+        "tolerance": float(tolerance),
+        "iter_limit": sizes.size if iter_limit is None else int(iter_limit),
+        "max_it": int(max_it),
+    }
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(int(n_jobs), len(seeds)))
+
+    if n_jobs == 1:
+        _init_worker(data)
+        try:
+            per_seed = [_sweep_seed(seed) for seed in seeds]
+        finally:
+            _WORKER.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(data,),
+        ) as pool:
+            per_seed = list(pool.map(_sweep_seed, seeds))
+
+    table = pd.DataFrame([row for rows in per_seed for row in rows])
+    # rows in grid order: seeds, then num_bins and thresholds as given
+    table = table.set_index(["seed", "num_bins", "surface_threshold"])
+    index = pd.MultiIndex.from_tuples(
+        [(s, b, float(t)) for s in seeds for b in num_bins
+         for t in thresholds],
+        names=table.index.names,
+    )
+    return table.loc[index].reset_index()
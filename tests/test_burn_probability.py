@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from scenfirepy import calc_burn_probability, calc_burn_probability_ensemble
+
+
+def test_ensemble_matches_mean_of_replicates():
+    surfaces = np.arange(1.0, 11.0)
+    replicates = [np.array([0, 3, 7]), np.array([7, 2]), np.array([9])]
+    dense = [
+        calc_burn_probability(np.isin(np.arange(10), r), surfaces)
+        for r in replicates
+    ]
+    res = calc_burn_probability_ensemble(
+        replicates, surfaces, return_variance=True
+    )
+    np.testing.assert_allclose(res["burn_probability"], np.mean(dense, 0))
+    np.testing.assert_allclose(res["variance"], np.var(dense, 0), atol=1e-12)
+
+    matrix = sparse.csr_matrix(
+        ([1] * 6, ([0, 0, 0, 1, 1, 2], [0, 3, 7, 7, 2, 9])), shape=(3, 10)
+    )
+    res_sparse = calc_burn_probability_ensemble(matrix, surfaces)
+    np.testing.assert_allclose(
+        res_sparse["burn_probability"], res["burn_probability"]
+    )
+
+
+def test_duplicate_indices_raise():
+    surfaces = np.arange(1.0, 11.0)
+    with pytest.raises(ValueError):
+        calc_burn_probability([1, 1, 4], surfaces, as_index=True)
+    with pytest.raises(ValueError):
+        calc_burn_probability_ensemble([[0, 2], [1, 1, 4]], surfaces)
+
+
+def test_sparse_input_left_unchanged():
+    surfaces = np.arange(1.0, 11.0)
+    matrix = sparse.csr_matrix(
+        ([1, 1, 0, 1], ([0, 0, 1, 1], [2, 5, 3, 7])), shape=(2, 10)
+    )
+    data, indices = matrix.data.copy(), matrix.indices.copy()
+    calc_burn_probability_ensemble(matrix, surfaces)
+    assert matrix.nnz == 4
+    np.testing.assert_array_equal(matrix.data, data)
+    np.testing.assert_array_equal(matrix.indices, indices)
+
+
+@pytest.mark.parametrize("value", [2, -1, 0.5])
+def test_sparse_non_indicator_entries_raise(value):
+    matrix = sparse.csr_matrix(
+        ([1, value], ([0, 1], [2, 3])), shape=(2, 10)
+    )
+    with pytest.raises(ValueError):
+        calc_burn_probability_ensemble(matrix, np.arange(1.0, 11.0))
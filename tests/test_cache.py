@@ -0,0 +1,36 @@
+import numpy as np
+
+from scenfirepy import select_events
+
+
+def _baseline_inputs():
+    sizes = np.arange(1, 41) % 9 + 1.0
+    return dict(
+        event_sizes=sizes,
+        event_probabilities=np.arange(40) % 5 * 1.0,
+        target_hist=np.array([0.3, 0.15, 0.1, 0.05]),
+        bins=np.array([1.0, 2.0, 4.0, 6.0, 10.0]),
+        reference_surface=sizes.sum(),
+        surface_threshold=60.0,
+        tolerance=0.0,
+        iter_limit=40,
+        max_it=25,
+        seed=11,
+    )
+
+
+def test_cache_hit_returns_stored_result(tmp_path):
+    inputs = _baseline_inputs()
+    first = select_events(method="keys", cache=str(tmp_path), **inputs)
+    assert any(tmp_path.iterdir())
+    second = select_events(method="keys", cache=str(tmp_path), **inputs)
+    np.testing.assert_array_equal(
+        first["surface_index"], second["surface_index"]
+    )
+    assert first["discrepancy"] == second["discrepancy"]
+    # another seed is another entry
+    other = select_events(
+        method="keys", cache=str(tmp_path), **dict(inputs, seed=12)
+    )
+    assert other["attempts"] == inputs["max_it"]
+    assert len(list(tmp_path.iterdir())) >= 2
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from scenfirepy import select_events
+
+
+def _baseline_inputs():
+    sizes = np.arange(1, 41) % 9 + 1.0
+    return dict(
+        event_sizes=sizes,
+        event_probabilities=np.arange(40) % 5 * 1.0,
+        target_hist=np.array([0.3, 0.15, 0.1, 0.05]),
+        bins=np.array([1.0, 2.0, 4.0, 6.0, 10.0]),
+        reference_surface=sizes.sum(),
+        surface_threshold=60.0,
+        tolerance=0.0,
+        iter_limit=40,
+        max_it=25,
+        seed=11,
+    )
+
+
+class _Interrupt(Exception):
+    pass
+
+
+@pytest.mark.parametrize("method", ["legacy", "keys", "tree", "multiset"])
+def test_resume_matches_uninterrupted_run(method, tmp_path):
+    inputs = _baseline_inputs()
+    reference = select_events(method=method, **inputs)
+
+    def interrupt(stats):
+        if stats["attempt"] == 17:
+            raise _Interrupt
+
+    path = str(tmp_path / "run.npz")
+    with pytest.raises(_Interrupt):
+        select_events(
+            method=method, checkpoint=path, checkpoint_every=5,
+            callback=interrupt, **inputs
+        )
+    resumed = select_events(method=method, resume_from=path, **inputs)
+
+    np.testing.assert_array_equal(
+        resumed["surface_index"], reference["surface_index"]
+    )
+    assert resumed["discrepancy"] == reference["discrepancy"]
+    assert resumed["attempts"] == reference["attempts"]
+
+
+@pytest.mark.parametrize("change", [
+    {"surface_threshold": 50.0},
+    {"target_hist": np.array([0.3, 0.15, 0.05, 0.1])},
+    {"strategy": "stratified"},
+])
+def test_resume_refuses_other_run(change, tmp_path):
+    inputs = _baseline_inputs()
+    path = str(tmp_path / "run.npz")
+    select_events(method="keys", checkpoint=path, **dict(inputs, max_it=5))
+    with pytest.raises(ValueError):
+        select_events(
+            method="keys", resume_from=path, **dict(inputs, **change)
+        )
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from scenfirepy import create_distribution, fit_powerlaw
+
+
+@pytest.fixture
+def fires():
+    observed = fit_powerlaw(1.0, 2.0, 200, seed=1)
+    simulated = fit_powerlaw(1.0, 2.0, 2000, seed=2)
+    return observed, simulated
+
+
+@pytest.mark.parametrize("strategy", ["random", "stratified"])
+def test_create_distribution_runs(fires, strategy):
+    observed, simulated = fires
+    res = create_distribution(
+        observed, simulated, 1.0, 2.0, max_iter=20, seed=3, strategy=strategy
+    )
+    assert res["surface_index"].size > 0
+    assert np.all(res["surface_index"] < simulated.size)
+    assert np.isfinite(res["discrepancy"])
+    assert res["attempts"] == 20
+
+
+def test_create_distribution_insufficient_data(fires):
+    observed, simulated = fires
+    with pytest.raises(ValueError):
+        create_distribution(simulated, observed, 1.0, 2.0, max_iter=5)
+
+
+def test_create_distribution_time_budget(fires):
+    observed, simulated = fires
+    res = create_distribution(
+        observed, simulated, 1.0, 2.0, max_iter=10**9, seed=3,
+        time_budget=0.2,
+    )
+    assert res["stop_reason"] == "time_budget"
+    assert 0 < res["attempts"] < 10**9
+
+
+def test_create_distribution_cache(fires, tmp_path):
+    observed, simulated = fires
+    first = create_distribution(
+        observed, simulated, 1.0, 2.0, max_iter=20, seed=3, cache=tmp_path
+    )
+    assert any(tmp_path.iterdir())
+    second = create_distribution(
+        observed, simulated, 1.0, 2.0, max_iter=20, seed=3, cache=tmp_path
+    )
+    np.testing.assert_array_equal(
+        first["surface_index"], second["surface_index"]
+    )
+    assert first["discrepancy"] == second["discrepancy"]
+
+
+def test_create_distribution_is_silent(fires, capsys):
+    observed, simulated = fires
+    create_distribution(observed, simulated, 1.0, 2.0, max_iter=5, seed=3)
+    assert capsys.readouterr().out == ""
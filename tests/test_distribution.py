@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from scenfirepy import (
+    estimate_powerlaw,
+    fit_powerlaw,
+    fit_powerlaw_batch,
+    powerlaw_gof,
+)
+
+
+@pytest.mark.parametrize("alpha", [1.5, 2.0, 2.5, 3.0])
+def test_fit_powerlaw_batch_first_row(alpha):
+    batch = fit_powerlaw_batch(2.5, alpha, 1000, 7, seed=4)
+    np.testing.assert_array_equal(
+        batch[0], fit_powerlaw(2.5, alpha, 1000, seed=4)
+    )
+
+
+@pytest.mark.parametrize("alpha", [1.8, 2.5, 3.2])
+def test_estimate_powerlaw_recovers_parameters(alpha):
+    # power-law tail above 5 and a uniform body below it
+    tail = fit_powerlaw(5.0, alpha, 5000, seed=1)
+    body = np.random.default_rng(2).uniform(1.0, 5.0, 1000)
+    fit = estimate_powerlaw(np.concatenate([body, tail]))
+    assert abs(fit["alpha"] - alpha) < 3 * fit["sigma"]
+    assert 4.5 < fit["xmin"] < 6.0
+    assert fit["n_tail"] > 4000
+
+
+def test_estimate_powerlaw_fixed_xmin_is_the_mle():
+    x = fit_powerlaw(2.0, 2.2, 1000, seed=3)
+    fit = estimate_powerlaw(x, xmin=2.0)
+    assert fit["alpha"] == pytest.approx(1 + x.size / np.log(x / 2.0).sum())
+
+
+def test_powerlaw_gof_p_values():
+    options = dict(n_boot=50, seed=1, max_candidates=100)
+    plausible = powerlaw_gof(fit_powerlaw(5.0, 2.5, 1000, seed=3), **options)
+    lognormal = np.random.default_rng(3).lognormal(1.0, 0.5, 1000)
+    rejected = powerlaw_gof(lognormal, **options)
+    assert plausible["p_value"] > 0.1
+    assert rejected["p_value"] < 0.05
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin  # noqa: E402
+
+from scenfirepy import load_event_store  # noqa: E402
+
+
+def _write(path, data):
+    with rasterio.open(
+        path, "w", driver="GTiff", height=data.shape[0],
+        width=data.shape[1], count=1, dtype="float32", crs="EPSG:32719",
+        transform=from_origin(0, 0, 30, 30),
+    ) as dst:
+        dst.write(data, 1)
+
+
+def test_changed_source_rebuilds_store_in_place(tmp_path):
+    path = str(tmp_path / "flp20.tif")
+    data = np.zeros((20, 30), dtype="float32")
+    data[2:5, 3:9] = 1.0
+    _write(path, data)
+
+    store = load_event_store(path)
+    assert store["sizes"].size == 18
+    assert os.listdir(tmp_path / ".scenfirepy") == ["flp20"]
+
+    # same store while the source is unchanged
+    assert load_event_store(path)["path"] == store["path"]
+
+    data[10:12, 0:5] = 2.0
+    _write(path, data)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    rebuilt = load_event_store(path)
+    assert rebuilt["path"] == store["path"]
+    assert rebuilt["sizes"].size == 28
+    assert os.listdir(tmp_path / ".scenfirepy") == ["flp20"]
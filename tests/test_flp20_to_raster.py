@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin  # noqa: E402
+
+from scenfirepy import flp20_to_raster  # noqa: E402
+
+
+@pytest.fixture
+def reference(tmp_path):
+    data = np.zeros((40, 50), dtype="float32")
+    data[5:10, 5:20] = 1.0
+    data[30:35, 10:12] = 2.0
+    data[12:20, 14:40:3] = 3.0
+    path = str(tmp_path / "flp20.tif")
+    with rasterio.open(
+        path, "w", driver="GTiff", height=40, width=50, count=1,
+        dtype="float32", crs="EPSG:32719",
+        transform=from_origin(0, 0, 30, 30),
+    ) as dst:
+        dst.write(data, 1)
+    return path, data
+
+
+@pytest.mark.parametrize("block_size", [0, -16, 24, 16.0, True])
+def test_block_size_must_be_multiple_of_16(reference, block_size):
+    path, data = reference
+    with pytest.raises(ValueError):
+        flp20_to_raster(path, np.ones(int((data > 0).sum())),
+                        block_size=block_size)
+
+
+def _baseline(data, bp):
+    """The original writer: fire cells in row-major order get bp."""
+    out = np.zeros(data.shape, dtype=float)
+    out[np.isfinite(data) & (data > 0)] = bp
+    return out
+
+
+@pytest.mark.parametrize("block_size", [16, 32, 256])
+def test_tiled_output_matches_baseline(reference, tmp_path, block_size):
+    path, data = reference
+    n = int((data > 0).sum())
+    bp = np.linspace(0.1, 1.0, n)
+    out = flp20_to_raster(
+        path, bp, str(tmp_path / "bp.tif"), block_size=block_size
+    )
+    with rasterio.open(out) as src:
+        assert src.block_shapes[0] == (block_size, block_size)
+        written = src.read(1)
+    np.testing.assert_array_equal(
+        written, _baseline(data, bp).astype("float32")
+    )
+
+    in_memory, _ = flp20_to_raster(path, bp, block_size=block_size)
+    np.testing.assert_array_equal(in_memory, _baseline(data, bp))
+
+
+@pytest.mark.parametrize("block_size", [16, 256])
+def test_sparse_output_matches_baseline(reference, tmp_path, block_size):
+    path, data = reference
+    n = int((data > 0).sum())
+    bp = np.linspace(0.1, 1.0, n)
+    index = np.array([80, 3, 0, 77, 40])
+    dense = np.zeros(n)
+    dense[index] = bp[index]
+
+    out = flp20_to_raster(
+        path, bp[index], str(tmp_path / "bp.tif"), block_size=block_size,
+        event_index=index,
+    )
+    with rasterio.open(out) as src:
+        written = src.read(1)
+    np.testing.assert_array_equal(
+        written, _baseline(data, dense).astype("float32")
+    )
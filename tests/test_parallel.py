@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pytest
+
+from scenfirepy import select_events, select_events_parallel
+
+
+def _baseline_inputs():
+    sizes = np.arange(1, 41) % 9 + 1.0
+    return dict(
+        event_sizes=sizes,
+        event_probabilities=np.arange(40) % 5 * 1.0,
+        target_hist=np.array([0.3, 0.15, 0.1, 0.05]),
+        bins=np.array([1.0, 2.0, 4.0, 6.0, 10.0]),
+        reference_surface=sizes.sum(),
+        surface_threshold=60.0,
+        tolerance=0.0,
+        iter_limit=40,
+        max_it=25,
+        seed=11,
+    )
+
+
+# 0.0: every restart runs to max_it; 0.2: restart 1 reaches the tolerance
+@pytest.mark.parametrize("tolerance", [0.0, 0.2])
+def test_result_does_not_depend_on_n_jobs(tolerance):
+    inputs = dict(_baseline_inputs(), tolerance=tolerance)
+    serial = select_events_parallel(
+        n_restarts=6, n_jobs=1, method="keys", **inputs
+    )
+    pooled = select_events_parallel(
+        n_restarts=6, n_jobs=2, method="keys", **inputs
+    )
+    np.testing.assert_array_equal(
+        serial["surface_index"], pooled["surface_index"]
+    )
+    assert serial["discrepancy"] == pooled["discrepancy"]
+    assert serial["restart"] == pooled["restart"]
+    assert serial["attempts"] == pooled["attempts"]
+    assert serial["stop_reason"] == pooled["stop_reason"]
+    assert [s["status"] for s in serial["restarts"]] == [
+        s["status"] for s in pooled["restarts"]
+    ]
+
+
+def test_best_restart_matches_direct_call():
+    inputs = _baseline_inputs()
+    result = select_events_parallel(
+        n_restarts=4, n_jobs=1, method="keys", **inputs
+    )
+    seed_seq = np.random.SeedSequence(inputs["seed"]).spawn(4)[
+        result["restart"]
+    ]
+    direct = select_events(
+        method="keys",
+        **dict(inputs, seed=np.random.default_rng(seed_seq)),
+    )
+    np.testing.assert_array_equal(
+        result["surface_index"], direct["surface_index"]
+    )
+    assert result["discrepancy"] == direct["discrepancy"]
+
+
+@pytest.mark.parametrize("limit", ["time_budget", "deadline"])
+def test_stop_reason_names_the_time_limit(limit):
+    inputs = dict(_baseline_inputs(), max_it=None)
+    # already reached: no restart starts
+    value = 0.0 if limit == "time_budget" else time.time()
+    result = select_events_parallel(
+        n_restarts=2, n_jobs=1, method="keys", **{limit: value}, **inputs
+    )
+    assert result["stop_reason"] == limit
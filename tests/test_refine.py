@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from scenfirepy import select_events
+from scenfirepy.distribution import _bin_index, _density
+
+
+def _baseline_inputs():
+    sizes = np.arange(1, 41) % 9 + 1.0
+    return dict(
+        event_sizes=sizes,
+        event_probabilities=np.arange(40) % 5 * 1.0,
+        target_hist=np.array([0.3, 0.15, 0.1, 0.05]),
+        bins=np.array([1.0, 2.0, 4.0, 6.0, 10.0]),
+        reference_surface=sizes.sum(),
+        surface_threshold=60.0,
+        tolerance=0.0,
+        iter_limit=40,
+        max_it=25,
+        seed=11,
+    )
+
+
+class _Interrupt(Exception):
+    pass
+
+
+REFINES = [True, 200, {"n_moves": 500, "temperature": 0.05}]
+
+
+@pytest.mark.parametrize("refine", REFINES)
+def test_refine_does_not_worsen_the_best(refine):
+    inputs = _baseline_inputs()
+    plain = select_events(method="keys", **inputs)
+    refined = select_events(method="keys", refine=refine, **inputs)
+    assert refined["discrepancy"] <= plain["discrepancy"]
+    assert refined["total_surface"] >= inputs["surface_threshold"]
+
+    # the reported discrepancy is that of the returned selection
+    bins = inputs["bins"]
+    index = refined["surface_index"]
+    assert np.unique(index).size == index.size
+    counts = np.bincount(
+        _bin_index(inputs["event_sizes"][index], bins),
+        minlength=bins.size,
+    )
+    hist = _density(counts[:bins.size - 1], np.diff(bins))
+    assert refined["discrepancy"] == pytest.approx(
+        np.abs(hist - inputs["target_hist"]).sum()
+    )
+
+
+@pytest.mark.parametrize("refine", REFINES)
+def test_resume_with_refine_matches_uninterrupted_run(refine, tmp_path):
+    inputs = _baseline_inputs()
+    reference = select_events(method="keys", refine=refine, **inputs)
+
+    def interrupt(stats):
+        if stats["attempt"] == 17:
+            raise _Interrupt
+
+    path = str(tmp_path / "run.npz")
+    with pytest.raises(_Interrupt):
+        select_events(
+            method="keys", refine=refine, checkpoint=path,
+            checkpoint_every=5, callback=interrupt, **inputs
+        )
+    resumed = select_events(
+        method="keys", refine=refine, resume_from=path, **inputs
+    )
+
+    np.testing.assert_array_equal(
+        resumed["surface_index"], reference["surface_index"]
+    )
+    assert resumed["discrepancy"] == reference["discrepancy"]
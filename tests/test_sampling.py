@@ -0,0 +1,133 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from scipy.stats import chi2_contingency
+
+from scenfirepy.distribution import _bin_index
+from scenfirepy.sampling import (
+    _SumTree,
+    _draw_keys,
+    _draw_legacy,
+    _draw_multiset,
+    _draw_tree,
+    _multiset_plan,
+)
+
+# draws per engine in the distribution tests
+N_DRAWS = 3000
+# significance level of the chi-square tests (the seeds are fixed, so the
+# tests are deterministic; this only guards against an unlucky choice)
+ALPHA = 1e-3
+
+# eight events in three bins; three of them have zero weight, and the
+# threshold needs about seven picks, so the uniform fallback is reached
+SIZES = np.array([1.0, 1.0, 1.0, 2.0, 2.0, 3.0, 3.0, 2.0])
+PROBS = np.array([1.0, 1.0, 0.0, 2.0, 2.0, 3.0, 0.0, 0.0])
+BINS = np.array([0.5, 1.5, 2.5, 3.5])
+THRESHOLD = 11.0
+
+
+def _args():
+    probs = PROBS / PROBS.sum()
+    bin_index = _bin_index(SIZES, BINS)
+    return SIZES, probs, THRESHOLD, SIZES.size, bin_index, BINS.size - 1
+
+
+def _engine(name):
+    sizes, probs, threshold, iter_limit, bin_index, n_bins = _args()
+    if name == "legacy":
+        return lambda rng: _draw_legacy(
+            rng, sizes, probs, threshold, iter_limit, bin_index, n_bins
+        )
+    if name == "keys":
+        return lambda rng: _draw_keys(
+            rng, sizes, probs, threshold, iter_limit, bin_index, n_bins
+        )
+    if name == "tree":
+        tree = _SumTree(probs)
+        return lambda rng: _draw_tree(
+            rng, sizes, probs, threshold, iter_limit, bin_index, n_bins,
+            tree=tree,
+        )
+    plan = _multiset_plan(sizes, probs, bin_index)
+    return lambda rng: _draw_multiset(
+        rng, sizes, probs, threshold, iter_limit, bin_index, n_bins, plan
+    )
+
+
+def _frequencies(draw, statistic, seed):
+    rng = np.random.default_rng(seed)
+    return Counter(statistic(*draw(rng)) for _ in range(N_DRAWS))
+
+
+def _same_law(freq_a, freq_b):
+    categories = sorted(set(freq_a) | set(freq_b))
+    table = np.array([
+        [freq_a[c] for c in categories],
+        [freq_b[c] for c in categories],
+    ])
+    return chi2_contingency(table)[1]
+
+
+def _bin_counts(selected, counts):
+    return tuple(counts.tolist())
+
+
+def _first_picks(selected, counts):
+    return tuple(np.asarray(selected)[:2].tolist())
+
+
+@pytest.mark.parametrize("engine", ["keys", "tree"])
+def test_bin_counts_follow_legacy_law(engine):
+    legacy = _frequencies(_engine("legacy"), _bin_counts, seed=1)
+    other = _frequencies(_engine(engine), _bin_counts, seed=2)
+    assert len(legacy) > 1
+    assert _same_law(legacy, other) > ALPHA
+
+
+@pytest.mark.parametrize("engine", ["keys", "tree"])
+def test_first_picks_follow_legacy_law(engine):
+    legacy = _frequencies(_engine("legacy"), _first_picks, seed=3)
+    other = _frequencies(_engine(engine), _first_picks, seed=4)
+    assert _same_law(legacy, other) > ALPHA
+
+
+@pytest.mark.parametrize("engine", ["legacy", "keys", "tree"])
+def test_zero_weight_events_drawn_last(engine):
+    probs = _args()[1]
+    draw = _engine(engine)
+    rng = np.random.default_rng(5)
+    zero = np.flatnonzero(probs == 0)
+    reached = 0
+    for _ in range(200):
+        selected = np.asarray(draw(rng)[0])
+        assert np.unique(selected).size == selected.size
+        late = np.isin(selected, zero)
+        if late.any():
+            reached += 1
+            assert np.all(late[np.argmax(late):])
+    assert reached > 0
+
+
+def test_multiset_counts_follow_legacy_law():
+    legacy = _frequencies(_engine("legacy"), _bin_counts, seed=1)
+    multiset = _frequencies(_engine("multiset"), _bin_counts, seed=2)
+    assert _same_law(legacy, multiset) > ALPHA
+
+
+def test_multiset_zero_weight_groups_drawn_last():
+    sizes, probs, threshold, iter_limit, bin_index, n_bins = _args()
+    draw = _engine("multiset")
+    rng = np.random.default_rng(5)
+    plan = _multiset_plan(sizes, probs, bin_index)
+    positive = plan["weight"] > 0
+    reached = 0
+    for _ in range(200):
+        # picks per group: zero-weight groups only once the others are
+        # exhausted
+        taken = draw(rng)[0]
+        if np.any(taken[~positive]):
+            reached += 1
+            assert np.all(taken[positive] == plan["count"][positive])
+    assert reached > 0
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from scenfirepy import build_target_hist, select_events
+
+
+def _baseline_inputs():
+    sizes = np.arange(1, 41) % 9 + 1.0
+    return dict(
+        event_sizes=sizes,
+        event_probabilities=np.arange(40) % 5 * 1.0,
+        target_hist=np.array([0.3, 0.15, 0.1, 0.05]),
+        bins=np.array([1.0, 2.0, 4.0, 6.0, 10.0]),
+        reference_surface=sizes.sum(),
+        surface_threshold=60.0,
+        tolerance=0.0,
+        iter_limit=40,
+        max_it=25,
+        seed=11,
+    )
+
+
+@pytest.fixture(scope="module")
+def problem():
+    rng = np.random.default_rng(0)
+    sizes = np.round((1 - rng.random(2000)) ** -0.7, 1)
+    hist = build_target_hist(sizes, np.ones(5), num_bins=10)
+    return dict(
+        event_sizes=sizes,
+        event_probabilities=np.ones(sizes.size),
+        target_hist=hist["target_hist"],
+        bins=hist["bins"],
+        reference_surface=sizes.sum(),
+        surface_threshold=0.05 * sizes.sum(),
+        tolerance=0.0,
+        iter_limit=sizes.size,
+        method="keys",
+    )
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_convergence_stop_is_within_tol_of_long_run(problem, seed):
+    tol = 0.01
+    stopped = select_events(
+        **problem, max_it=2000, seed=seed, convergence_tol=tol
+    )
+    long_run = select_events(**problem, max_it=2000, seed=seed)
+    assert stopped["stop_reason"] == "converged"
+    assert 100 <= stopped["attempts"] < 2000
+    assert stopped["discrepancy"] - long_run["discrepancy"] <= tol
+    assert 0 <= stopped["estimated_min_discrepancy"] <= stopped["discrepancy"]
+
+
+def test_legacy_matches_baseline():
+    # result of the original select_events loop for the same inputs
+    res = select_events(method="legacy", **_baseline_inputs())
+    assert res["surface_index"].tolist() == [
+        22, 19, 4, 23, 36, 8, 1, 3, 24, 39, 6, 38, 26, 9,
+    ]
+    assert res["discrepancy"] == 0.21071428571428572
+    assert res["total_surface"] == 61.0
+
+
+@pytest.mark.parametrize("method", ["tree", "keys", "batch", "multiset",
+                                    "legacy"])
+def test_negative_probabilities_raise(method):
+    inputs = _baseline_inputs()
+    probs = inputs["event_probabilities"].copy()
+    probs[3] = -1.0
+    with pytest.raises(ValueError):
+        select_events(
+            method=method, **dict(inputs, event_probabilities=probs)
+        )
+
+
+@pytest.mark.parametrize("memory_budget", [2**16, 2**20, 2**22])
+@pytest.mark.parametrize("weighted", [False, True])
+def test_batch_matches_keys(problem, memory_budget, weighted):
+    problem = dict(problem)
+    if weighted:
+        # large picks first: the sorted prefix has to grow for some rows
+        problem["event_probabilities"] = problem["event_sizes"]
+        problem["surface_threshold"] = 0.3 * problem["event_sizes"].sum()
+    keys = select_events(**problem, max_it=60, seed=7)
+    batch = select_events(
+        **dict(problem, method="batch"), max_it=60, seed=7,
+        memory_budget=memory_budget,
+    )
+    np.testing.assert_array_equal(
+        batch["surface_index"], keys["surface_index"]
+    )
+    assert batch["discrepancy"] == keys["discrepancy"]
+    assert batch["attempts"] == keys["attempts"]
+
+
+def test_multiset_selection_is_consistent():
+    inputs = _baseline_inputs()
+    res = select_events(method="multiset", **inputs)
+    sizes = inputs["event_sizes"]
+    index = res["surface_index"]
+    assert np.unique(index).size == index.size
+    np.testing.assert_array_equal(res["events"], sizes[index])
+    assert res["total_surface"] == sizes[index].sum()
+    assert res["total_surface"] >= inputs["surface_threshold"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from scenfirepy import build_target_hist, select_events, sweep
+
+
+@pytest.fixture(scope="module")
+def events():
+    rng = np.random.default_rng(0)
+    sizes = np.round(rng.pareto(1.2, 300) + 1, 1)
+    return sizes, rng.random(300), sizes * 1.1
+
+
+def test_rows_match_select_events(events):
+    sizes, probs, surfaces = events
+    thresholds = [0.3 * sizes.sum(), 0.1 * sizes.sum()]
+    table = sweep(
+        sizes, probs, surfaces, thresholds, num_bins=[5, 8], seeds=[3, 4],
+        max_it=30,
+    )
+    assert len(table) == 8
+    for row in table.itertuples():
+        target = build_target_hist(sizes, surfaces, num_bins=row.num_bins)
+        direct = select_events(
+            event_sizes=sizes,
+            event_probabilities=probs,
+            target_hist=target["target_hist"],
+            bins=target["bins"],
+            reference_surface=sizes.sum(),
+            surface_threshold=row.surface_threshold,
+            tolerance=0.0,
+            iter_limit=sizes.size,
+            max_it=30,
+            seed=row.seed,
+            method="keys",
+        )
+        np.testing.assert_array_equal(
+            row.surface_index, direct["surface_index"]
+        )
+        assert row.discrepancy == direct["discrepancy"]
+        assert row.attempts == direct["attempts"]
+        assert row.total_surface == direct["total_surface"]
+
+
+def test_duplicate_seeds_raise(events):
+    sizes, probs, surfaces = events
+    with pytest.raises(ValueError, match="seeds"):
+        sweep(sizes, probs, surfaces, [0.2 * sizes.sum()], 5, seeds=[1, 1])
+
+
+def test_negative_probabilities_raise(events):
+    sizes, probs, surfaces = events
+    probs = probs.copy()
+    probs[0] = -1.0
+    with pytest.raises(ValueError, match="non-negative"):
+        sweep(sizes, probs, surfaces, [0.2 * sizes.sum()], 5, seeds=1)